@@ -0,0 +1,13 @@
+"""
+Celery application for LMS background tasks
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.config.settings')
+
+app = Celery('lms')
+# All CELERY_* settings in settings.py configure this app
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -1,6 +1,14 @@
-from django.test import TestCase
+import queue
+from unittest import mock
+from django.test import TestCase, RequestFactory
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from src.shared.decorators import log_action, flush_admin_logs, require_admin
 from .models import AdminDashboardLog
+from .views import AdminUserViewSet
 
 User = get_user_model()
 
@@ -14,3 +22,69 @@ class AdminServiceTests(TestCase):
             description="Test log entry"
         )
         self.assertIsNotNone(log.id)
+    def test_log_action_queues_and_bulk_flushes(self):
+        class View:
+            queryset = User.objects.all()
+            @log_action("user_banned")
+            def ban(self, request, pk=None):
+                return Response({"status": "success"})
+        request = RequestFactory().post("/api/admin/users/7/ban/", REMOTE_ADDR="10.0.0.1")
+        request.user = self.admin
+        with mock.patch("src.shared.decorators._start_admin_log_flusher"), \
+                self.captureOnCommitCallbacks(execute=True):
+            View().ban(request, pk=7)
+            View().ban(request, pk=8)
+            # A rolled-back action is never queued
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                View().ban(request, pk=9)
+                raise RuntimeError
+        self.assertFalse(AdminDashboardLog.objects.exists())
+        self.assertEqual(flush_admin_logs(), 2)
+        logs = AdminDashboardLog.objects.order_by("target_id")
+        self.assertEqual([log.target_id for log in logs], [7, 8])
+        self.assertEqual(logs[0].admin_user, self.admin)
+        self.assertEqual(logs[0].target_type, "customuser")
+
+    def test_admin_log_queue_drops_and_reports_overflow(self):
+        class View:
+            queryset = User.objects.all()
+            @log_action("user_banned")
+            def ban(self, request, pk=None):
+                return Response({"status": "success"})
+        request = RequestFactory().post("/api/admin/users/7/ban/")
+        request.user = self.admin
+        with mock.patch("src.shared.decorators._start_admin_log_flusher"), \
+                mock.patch("src.shared.decorators._admin_log_queue", queue.Queue(maxsize=1)):
+            with self.captureOnCommitCallbacks(execute=True):
+                View().ban(request, pk=7)
+                View().ban(request, pk=8)
+            with self.assertLogs("src.shared.decorators", level="ERROR") as logs:
+                self.assertEqual(flush_admin_logs(), 1)
+        self.assertIn("Dropped 1 admin log entries", logs.output[0])
+        self.assertEqual(list(AdminDashboardLog.objects.values_list("target_id", flat=True)), [7])
+
+    def test_require_admin_rejects_non_staff_through_exception_handler(self):
+        @api_view(["GET"])
+        @require_admin
+        def admin_only(request):
+            return Response({"status": "success"})
+        user = User.objects.create(email="learner@lms.com", username="learner")
+        request = RequestFactory().get("/api/admin/only/")
+        force_authenticate(request, user=user)
+        response = admin_only(request)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data["message"], "Admin access required")
+        self.assertEqual(response.data["error_code"], "PERMISSION_DENIED")
+        force_authenticate(request, user=self.admin)
+        self.assertEqual(admin_only(request).status_code, 200)
+
+    def test_user_list_serializes_value_rows(self):
+        User.objects.create(email="banned@lms.com", username="banned", is_banned=True)
+        request = APIRequestFactory().get("/api/admin/users/", {"is_banned": "true"})
+        force_authenticate(request, user=self.admin)
+        response = AdminUserViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(response.status_code, 200)
+        rows = response.data.get("results", response.data.get("data"))
+        self.assertEqual([row["email"] for row in rows], ["banned@lms.com"])
+        self.assertTrue(rows[0]["is_banned"])
+        self.assertIn("created_at", rows[0])
@@ -59,6 +59,10 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         if is_banned:
             queryset = queryset.filter(is_banned=is_banned.lower() == 'true')
         
+        # Plain dict rows for just the listed columns; the serializer reads mappings directly,
+        # so no model instances are built per row
+        queryset = queryset.values(*UserListSerializer.Meta.fields)
+        
         # Pagination
         page = self.paginate_queryset(queryset)
         if page is not None:
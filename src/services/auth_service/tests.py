@@ -1,7 +1,10 @@
 from django.test import TestCase
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from src.shared.authentication import auth_user_cache_key
 from .models import EmailVerificationToken, PasswordResetToken, WalletConnection
 
 User = get_user_model()
@@ -24,6 +27,18 @@ class AuthServiceTests(TestCase):
         }, format='json')
         self.assertEqual(response.status_code, 201)
 
+    def test_register_nested_list_error_is_400(self):
+        # The int-keyed error dict must survive request/response logging
+        response = self.client.post(reverse('auth-register'), {
+            "email": "listerr@example.com",
+            "username": "listerr",
+            "password": "Testpass123!",
+            "password_confirm": "Testpass123!",
+            "learning_goals": [{}]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("0", response.json()["errors"]["learning_goals"])
+
     def test_login(self):
         response = self.client.post(reverse('auth-login'), {
             "email": "faketest@example.com",
@@ -57,3 +72,27 @@ class AuthServiceTests(TestCase):
         }, format='json', HTTP_AUTHORIZATION=f"Bearer {self.user.tokens['access'] if hasattr(self.user, 'tokens') else ''}")
         # If you mock the wallet, you can assert on 201
         self.assertTrue(response.status_code in (200, 201))
+
+    def test_jwt_user_is_cached_until_saved(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.assertEqual(self.client.get(reverse('auth-profile')).status_code, 200)
+        key = auth_user_cache_key(self.user.pk)
+        self.assertIsNotNone(cache.get(key))
+        # Only auth fields are cached: never the password hash; token_balance loads live
+        self.assertEqual(cache.get(key).get_deferred_fields() & {"password", "token_balance"}, {"password", "token_balance"})
+        User.objects.filter(pk=self.user.pk).update(token_balance=7)
+        self.assertEqual(cache.get(key).token_balance, 7)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(self.client.get(reverse('auth-profile')).status_code, 401)
+
+    def test_profile_loads_cached_user_in_one_query(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.client.get(reverse('auth-profile'))  # warm the cache
+        with self.assertNumQueries(1):  # the full row, not a query per deferred column
+            response = self.client.get(reverse('auth-profile'))
+        self.assertEqual(response.data['data']['email'], self.user.email)
@@ -25,6 +25,7 @@ from .serializers import (
     ConnectWalletSerializer, TokenResponseSerializer
 )
 from src.shared.utils import send_email, get_client_ip
+from src.shared.authentication import with_all_fields
 from src.shared.exceptions import (
     ValidationError, AuthenticationError, ConflictError,
     ResourceNotFoundError
@@ -198,19 +199,20 @@ class AuthViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def profile(self, request):
-        serializer = ProfileSerializer(request.user)
+        serializer = ProfileSerializer(with_all_fields(request.user))
         return Response({'status': 'success', 'data': serializer.data})
 
     @action(detail=False, methods=['put'], permission_classes=[IsAuthenticated])
     def update_profile(self, request):
-        serializer = UpdateProfileSerializer(request.user, data=request.data, partial=True)
+        user = with_all_fields(request.user)
+        serializer = UpdateProfileSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        logger.info(f"Profile updated: {request.user.email}")
+        logger.info(f"Profile updated: {user.email}")
         return Response({
             'status': 'success',
             'message': 'Profile updated successfully',
-            'data': ProfileSerializer(request.user).data
+            'data': ProfileSerializer(user).data
         })
 
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
@@ -10,6 +10,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -25,6 +27,7 @@ from .stripe_manager import StripeManager
 from src.shared.exceptions import ValidationError, PaymentError, ResourceNotFoundError
 from django.conf import settings
 
+User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
@@ -183,8 +186,10 @@ class StripePurchaseViewSet(viewsets.ModelViewSet):
             purchase.save()
             
             # Add tokens to user balance (in-app, not on-chain)
-            request.user.token_balance += purchase.tokens_purchased
-            request.user.save()
+            User.objects.filter(pk=request.user.pk).update(
+                token_balance=F('token_balance') + purchase.tokens_purchased
+            )
+            request.user.refresh_from_db(fields=['token_balance'])
             
             # Create invoice
             Invoice.objects.create(
@@ -293,8 +298,9 @@ class RefundViewSet(viewsets.ModelViewSet):
                 purchase.save()
                 
                 # Deduct tokens from user
-                request.user.token_balance -= purchase.tokens_purchased
-                request.user.save()
+                User.objects.filter(pk=request.user.pk).update(
+                    token_balance=F('token_balance') - purchase.tokens_purchased
+                )
             
             logger.info(f"Refund initiated: {refund.id}")
             
@@ -393,8 +399,9 @@ class WebhookViewSet(viewsets.ViewSet):
             purchase.save()
             
             # Add tokens to user (async would be better)
-            purchase.user.token_balance += purchase.tokens_purchased
-            purchase.user.save()
+            User.objects.filter(pk=purchase.user_id).update(
+                token_balance=F('token_balance') + purchase.tokens_purchased
+            )
             
             logger.info(f"Tokens added to {purchase.user.email}")
         
@@ -425,8 +432,9 @@ class WebhookViewSet(viewsets.ViewSet):
             purchase.save()
             
             # Remove tokens from user
-            purchase.user.token_balance -= purchase.tokens_purchased
-            purchase.user.save()
+            User.objects.filter(pk=purchase.user_id).update(
+                token_balance=F('token_balance') - purchase.tokens_purchased
+            )
             
             logger.info(f"Tokens refunded for {purchase.user.email}")
         
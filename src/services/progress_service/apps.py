@@ -5,3 +5,7 @@ class ProgressServiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.services.progress_service'
     verbose_name = 'Progress Service'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import src.services.progress_service.signals  # noqa
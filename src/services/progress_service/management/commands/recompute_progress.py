@@ -0,0 +1,52 @@
+"""
+Management command to recompute course progress aggregates from lesson and quiz activity
+Usage: python src/manage.py recompute_progress [--user-id ID]
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.shared.utils import calculate_completion_percentage
+from src.services.progress_service.models import CourseProgress
+from src.services.progress_service.signals import dashboard_cache_key
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recompute CourseProgress lesson/quiz aggregates from LessonProgress and QuizAttempt'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Recompute a single user only',
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(course_progress__isnull=False).distinct().only('id')
+        if options['user_id']:
+            users = users.filter(id=options['user_id'])
+
+        updated = 0
+        for user in users.iterator():
+            now = timezone.now()
+            for course in CourseProgress.objects.with_computed(user):
+                total_lessons = course.total_lessons or course.computed_total_lessons
+                # .update() writes only these columns and bypasses auto_now, so set updated_at explicitly
+                CourseProgress.objects.filter(pk=course.pk).update(
+                    lessons_completed=course.computed_lessons_completed,
+                    quizzes_passed=course.computed_quizzes_passed,
+                    average_quiz_score=course.computed_average_quiz_score or 0,
+                    completion_percentage=calculate_completion_percentage(
+                        course.computed_lessons_completed, total_lessons
+                    ),
+                    updated_at=now,
+                )
+                updated += 1
+            # .update() skips post_save, so drop the cached dashboard here
+            cache.delete(dashboard_cache_key(user.id))
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed {updated} course progress rows'))
@@ -0,0 +1,63 @@
+"""
+Management command to record today's progress snapshot for every enrolled course
+Usage: python src/manage.py snapshot_progress
+"""
+
+from django.core.management.base import BaseCommand
+
+from src.services.progress_service.models import CourseProgress, ProgressSnapshot
+
+SNAPSHOT_UPDATE_FIELDS = [
+    'lessons_completed', 'quizzes_passed', 'average_quiz_score',
+    'completion_percentage', 'total_time_minutes', 'tokens_earned',
+]
+
+
+class Command(BaseCommand):
+    help = 'Record daily progress snapshots from current course progress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of snapshots written per INSERT ... ON CONFLICT statement',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        courses = CourseProgress.objects.only(
+            'user_id', 'course_id', 'lessons_completed', 'quizzes_passed',
+            'average_quiz_score', 'completion_percentage', 'total_time_hours', 'tokens_earned'
+        ).iterator(chunk_size=batch_size)
+
+        total = 0
+        batch = []
+        for progress in courses:
+            batch.append(ProgressSnapshot(
+                user_id=progress.user_id,
+                course_id=progress.course_id,
+                lessons_completed=progress.lessons_completed,
+                quizzes_passed=progress.quizzes_passed,
+                average_quiz_score=progress.average_quiz_score,
+                completion_percentage=progress.completion_percentage,
+                total_time_minutes=int(progress.total_time_hours * 60),
+                tokens_earned=progress.tokens_earned,
+            ))
+            if len(batch) >= batch_size:
+                total += self._upsert(batch)
+                batch = []
+        if batch:
+            total += self._upsert(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Recorded {total} progress snapshots'))
+
+    def _upsert(self, batch):
+        # One INSERT ... ON CONFLICT DO UPDATE per batch instead of SELECT + INSERT/UPDATE per row
+        ProgressSnapshot.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            update_fields=SNAPSHOT_UPDATE_FIELDS,
+            unique_fields=['user', 'course_id', 'snapshot_date'],
+        )
+        return len(batch)
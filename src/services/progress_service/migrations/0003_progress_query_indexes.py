@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def renumber_duplicate_attempts(apps, schema_editor):
+    """Renumber attempts in (user, quiz) groups that unlocked COUNT(*)+1 numbering left duplicated"""
+    QuizAttempt = apps.get_model('progress_service', 'QuizAttempt')
+    # order_by() clears the model ordering, which would otherwise join the GROUP BY
+    duplicated = (
+        QuizAttempt.objects.order_by().values('user_id', 'quiz_id', 'attempt_number')
+        .annotate(n=Count('id')).filter(n__gt=1)
+    )
+    for user_id, quiz_id in {(row['user_id'], row['quiz_id']) for row in duplicated}:
+        attempts = list(QuizAttempt.objects.filter(user_id=user_id, quiz_id=quiz_id).order_by('started_at', 'id'))
+        for number, attempt in enumerate(attempts, start=1):
+            attempt.attempt_number = number
+        QuizAttempt.objects.bulk_update(attempts, ['attempt_number'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress_service', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='lessonprogress',
+            options={'ordering': ['-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='quizattempt',
+            options={'ordering': ['-id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='quiz_attemp_is_pass_93f66a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='quiz_attemp_user_id_558d63_idx',
+        ),
+        migrations.RunPython(renumber_duplicate_attempts, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='quizattempt',
+            unique_together={('user', 'quiz_id', 'attempt_number')},
+        ),
+        migrations.AddIndex(
+            model_name='courseprogress',
+            index=models.Index(fields=['user', '-updated_at', '-id'], name='course_prog_user_id_61e6fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonprogress',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['user', '-completed_at'], name='lp_user_completed'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', '-started_at'], name='quiz_attemp_user_id_69a804_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('is_passed', False)), fields=['user', '-completed_at'], name='qa_failed'),
+        ),
+    ]
@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models import Q, Count, Avg
+from django.db.models.functions import Coalesce
+from django.db.models.sql.constants import LOUTER
+from django_cte import CTE, with_cte
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -29,10 +33,12 @@ class LessonProgress(models.Model):
     class Meta:
         db_table = 'lesson_progress'
         unique_together = ['user', 'lesson_id']
-        ordering = ['-completed_at']
+        # Default to PK order; endpoints that need completion order ask for it explicitly
+        ordering = ['-id']
         indexes = [
             models.Index(fields=['user', 'course_id']),
             models.Index(fields=['status']),
+            models.Index(fields=['user', '-completed_at'], name='lp_user_completed', condition=Q(completed_at__isnull=False)),
         ]
     def __str__(self):
         return f"{self.user.email} - {self.lesson_title}"
@@ -64,10 +70,15 @@ class QuizAttempt(models.Model):
     last_blockchain_status = models.TextField(blank=True)
     class Meta:
         db_table = 'quiz_attempts'
-        ordering = ['-completed_at']
+        # Attempt numbers are assigned under a user-row lock; the constraint backs that up.
+        # Its index also answers MAX(attempt_number) per (user, quiz).
+        unique_together = ['user', 'quiz_id', 'attempt_number']
+        ordering = ['-id']
         indexes = [
-            models.Index(fields=['user', 'quiz_id']),
-            models.Index(fields=['is_passed']),
+            # Cursor pagination of history
+            models.Index(fields=['user', '-started_at']),
+            # Partial index for "attempts to retake"; a plain is_passed index is too unselective to help
+            models.Index(fields=['user', '-completed_at'], name='qa_failed', condition=Q(is_passed=False)),
         ]
     def __str__(self):
         return f"{self.user.email} - {self.quiz_title} (Attempt {self.attempt_number})"
@@ -122,6 +133,35 @@ class ModuleProgress(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.module_title}"
 
+class CourseProgressQuerySet(models.QuerySet):
+    def with_computed(self, user):
+        """
+        Annotate the user's courses with lesson and quiz aggregates computed
+        from LessonProgress/QuizAttempt in a single WITH ... query
+        """
+        lessons = CTE(
+            LessonProgress.objects.filter(user=user).order_by().values('course_id').annotate(
+                completed=Count('id', filter=Q(status='completed')),
+                total=Count('id'),
+            ),
+            name='lp'
+        )
+        quizzes = CTE(
+            QuizAttempt.objects.filter(user=user).order_by().values('course_id').annotate(
+                avg_score=Avg('percentage_score'),
+                passed=Count('id', filter=Q(is_passed=True)),
+            ),
+            name='qa'
+        )
+        courses = lessons.join(self.filter(user=user), course_id=lessons.col.course_id, _join_type=LOUTER)
+        courses = quizzes.join(courses, course_id=quizzes.col.course_id, _join_type=LOUTER)
+        return with_cte(lessons, quizzes, select=courses.annotate(
+            computed_lessons_completed=Coalesce(lessons.col.completed, 0),
+            computed_total_lessons=Coalesce(lessons.col.total, 0),
+            computed_average_quiz_score=quizzes.col.avg_score,
+            computed_quizzes_passed=Coalesce(quizzes.col.passed, 0),
+        ))
+
 class CourseProgress(models.Model):
     STATUS_CHOICES = [
         ('enrolled', 'Enrolled'),
@@ -151,6 +191,7 @@ class CourseProgress(models.Model):
     blockchain_event_tx_hash = models.CharField(max_length=255, null=True, blank=True)
     last_blockchain_status = models.TextField(blank=True)
     updated_at = models.DateTimeField(auto_now=True)
+    objects = CourseProgressQuerySet.as_manager()
     class Meta:
         db_table = 'course_progress'
         unique_together = ['user', 'course_id']
@@ -158,6 +199,8 @@ class CourseProgress(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['completion_percentage']),
+            # Cursor pagination of my_courses
+            models.Index(fields=['user', '-updated_at', '-id']),
         ]
     def __str__(self):
         return f"{self.user.email} - {self.course_title}"
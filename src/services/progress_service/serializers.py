@@ -2,12 +2,25 @@
 Progress service serializers
 """
 
+import json
+
 from rest_framework import serializers
 from .models import (
     LessonProgress, QuizAttempt, QuestionResponse,
     ModuleProgress, CourseProgress, ProgressSnapshot
 )
 
+# Unbound DRF fields reused to format values in the hand-written to_representation methods below
+_DATETIME = serializers.DateTimeField()
+_DATE = serializers.DateField()
+_PERCENT = serializers.DecimalField(max_digits=5, decimal_places=2)
+_HOURS = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+def _fmt(field, value):
+    return None if value is None else field.to_representation(value)
+
+
 class LessonProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = LessonProgress
@@ -18,6 +31,22 @@ class LessonProgressSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'started_at', 'completed_at', 'blockchain_event_tx_hash', 'last_blockchain_status']
 
+    def to_representation(self, instance):
+        # Hot read path (by_course, mark_progress): fixed dict instead of walking the Field chain
+        return {
+            'id': instance.id,
+            'lesson_id': instance.lesson_id,
+            'lesson_title': instance.lesson_title,
+            'status': instance.status,
+            'video_watched_percentage': instance.video_watched_percentage,
+            'time_spent_minutes': instance.time_spent_minutes,
+            'tokens_earned': instance.tokens_earned,
+            'started_at': _fmt(_DATETIME, instance.started_at),
+            'completed_at': _fmt(_DATETIME, instance.completed_at),
+            'blockchain_event_tx_hash': instance.blockchain_event_tx_hash,
+            'last_blockchain_status': instance.last_blockchain_status,
+        }
+
 class QuestionResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = QuestionResponse
@@ -27,8 +56,20 @@ class QuestionResponseSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'is_correct', 'points_earned', 'feedback']
 
+    def to_representation(self, instance):
+        return {
+            'id': instance.id,
+            'question_id': instance.question_id,
+            'question_text': instance.question_text,
+            'question_type': instance.question_type,
+            'user_response': instance.user_response,
+            'is_correct': instance.is_correct,
+            'points_earned': instance.points_earned,
+            'feedback': instance.feedback,
+        }
+
 class QuizAttemptSerializer(serializers.ModelSerializer):
-    question_responses = QuestionResponseSerializer(many=True, read_only=True)
+    question_responses = serializers.SerializerMethodField()
     class Meta:
         model = QuizAttempt
         fields = [
@@ -43,6 +84,34 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
             'blockchain_event_tx_hash', 'last_blockchain_status'
         ]
 
+    def get_question_responses(self, obj):
+        # Read the list prefetched by the viewset (to_attr) instead of going through the related manager
+        responses = getattr(obj, 'prefetched_responses', None)
+        if responses is None:
+            responses = obj.question_responses.all()
+        return QuestionResponseSerializer(responses, many=True).data
+
+    def to_representation(self, instance):
+        # Hot read path (history): fixed dict instead of walking the Field chain
+        return {
+            'id': instance.id,
+            'quiz_id': instance.quiz_id,
+            'quiz_title': instance.quiz_title,
+            'attempt_number': instance.attempt_number,
+            'status': instance.status,
+            'total_points': instance.total_points,
+            'points_earned': instance.points_earned,
+            'percentage_score': _fmt(_PERCENT, instance.percentage_score),
+            'is_passed': instance.is_passed,
+            'time_spent_minutes': instance.time_spent_minutes,
+            'tokens_earned': instance.tokens_earned,
+            'started_at': _fmt(_DATETIME, instance.started_at),
+            'completed_at': _fmt(_DATETIME, instance.completed_at),
+            'question_responses': self.get_question_responses(instance),
+            'blockchain_event_tx_hash': instance.blockchain_event_tx_hash,
+            'last_blockchain_status': instance.last_blockchain_status,
+        }
+
 class ModuleProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = ModuleProgress
@@ -54,6 +123,27 @@ class ModuleProgressSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        # Read-only: build the dict directly instead of dispatching through each Field
+        return {
+            'id': instance.id,
+            'module_id': instance.module_id,
+            'module_title': instance.module_title,
+            'total_lessons': instance.total_lessons,
+            'lessons_completed': instance.lessons_completed,
+            'completion_percentage': _fmt(_PERCENT, instance.completion_percentage),
+            'total_quizzes': instance.total_quizzes,
+            'quizzes_passed': instance.quizzes_passed,
+            'average_quiz_score': _fmt(_PERCENT, instance.average_quiz_score),
+            'total_time_minutes': instance.total_time_minutes,
+            'tokens_earned': instance.tokens_earned,
+            'started_at': _fmt(_DATETIME, instance.started_at),
+            'completed_at': _fmt(_DATETIME, instance.completed_at),
+            'blockchain_event_tx_hash': instance.blockchain_event_tx_hash,
+            'last_blockchain_status': instance.last_blockchain_status,
+            'updated_at': _fmt(_DATETIME, instance.updated_at),
+        }
+
 class CourseProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = CourseProgress
@@ -67,6 +157,33 @@ class CourseProgressSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    def to_representation(self, instance):
+        # Read-only: build the dict directly instead of dispatching through each Field
+        return {
+            'id': instance.id,
+            'course_id': instance.course_id,
+            'course_title': instance.course_title,
+            'status': instance.status,
+            'total_modules': instance.total_modules,
+            'modules_completed': instance.modules_completed,
+            'total_lessons': instance.total_lessons,
+            'lessons_completed': instance.lessons_completed,
+            'completion_percentage': _fmt(_PERCENT, instance.completion_percentage),
+            'total_quizzes': instance.total_quizzes,
+            'quizzes_passed': instance.quizzes_passed,
+            'average_quiz_score': _fmt(_PERCENT, instance.average_quiz_score),
+            'total_time_hours': _fmt(_HOURS, instance.total_time_hours),
+            'tokens_earned': instance.tokens_earned,
+            'certificate_issued': instance.certificate_issued,
+            'certificate_issued_at': _fmt(_DATETIME, instance.certificate_issued_at),
+            'enrolled_at': _fmt(_DATETIME, instance.enrolled_at),
+            'started_at': _fmt(_DATETIME, instance.started_at),
+            'completed_at': _fmt(_DATETIME, instance.completed_at),
+            'blockchain_event_tx_hash': instance.blockchain_event_tx_hash,
+            'last_blockchain_status': instance.last_blockchain_status,
+            'updated_at': _fmt(_DATETIME, instance.updated_at),
+        }
+
 class ProgressSnapshotSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProgressSnapshot
@@ -77,15 +194,95 @@ class ProgressSnapshotSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'snapshot_date', 'blockchain_event_tx_hash', 'last_blockchain_status']
 
+    def to_representation(self, instance):
+        # Only served by a read-only viewset: build the dict directly
+        return {
+            'id': instance.id,
+            'lessons_completed': instance.lessons_completed,
+            'quizzes_passed': instance.quizzes_passed,
+            'average_quiz_score': _fmt(_PERCENT, instance.average_quiz_score),
+            'completion_percentage': _fmt(_PERCENT, instance.completion_percentage),
+            'total_time_minutes': instance.total_time_minutes,
+            'tokens_earned': instance.tokens_earned,
+            'snapshot_date': _fmt(_DATE, instance.snapshot_date),
+            'blockchain_event_tx_hash': instance.blockchain_event_tx_hash,
+            'last_blockchain_status': instance.last_blockchain_status,
+        }
+
 class UpdateLessonProgressSerializer(serializers.Serializer):
     lesson_id = serializers.IntegerField()
     status = serializers.ChoiceField(choices=['not_started', 'in_progress', 'completed'])
     video_watched_percentage = serializers.IntegerField(required=False, min_value=0, max_value=100)
     time_spent_minutes = serializers.IntegerField(required=False, min_value=0)
 
+def _is_finite_json(value):
+    """False for values with NaN/Infinity (e.g. 1e999 parses to inf), which JSON columns reject"""
+    try:
+        json.dumps(value, allow_nan=False)
+    except ValueError:
+        return False
+    return True
+
+
 class SubmitQuizSerializer(serializers.Serializer):
     quiz_id = serializers.IntegerField()
-    responses = serializers.JSONField()  # {question_id: answer}
+    responses = serializers.DictField()  # {question_id: answer}; a list or scalar is a 400
+
+    def validate_responses(self, value):
+        if not _is_finite_json(value):
+            raise serializers.ValidationError("Answers must be finite numbers or strings")
+        return value
+
+
+# Fast paths for the two hot POST endpoints. They accept only input the DRF serializers
+# above would accept unchanged and return None for anything else, so the caller falls
+# back to full validation (and its error messages).
+
+_LESSON_STATUSES = frozenset(UpdateLessonProgressSerializer._declared_fields['status'].choices)
+
+
+# Longer digit strings (and int()'s 4300-digit limit) are left to IntegerField's own checks
+_MAX_FAST_INT_DIGITS = 18
+
+
+def _as_int(value):
+    if type(value) is int:
+        return value
+    # isdigit()/isdecimal() alone accept non-ASCII digits like '²' that int() rejects
+    if (isinstance(value, str) and value.isascii() and value.isdecimal()
+            and len(value) <= _MAX_FAST_INT_DIGITS):
+        return int(value)
+    return None
+
+
+def parse_lesson_progress(data):
+    """Validated data for UpdateLessonProgressSerializer, or None to fall back to DRF"""
+    if not isinstance(data, dict):
+        return None
+    lesson_id = _as_int(data.get('lesson_id'))
+    status = data.get('status')
+    if lesson_id is None or not isinstance(status, str) or status not in _LESSON_STATUSES:
+        return None
+    validated = {'lesson_id': lesson_id, 'status': status}
+    # Both fields declare min_value=0
+    for name, upper in (('video_watched_percentage', 100), ('time_spent_minutes', None)):
+        if name in data:
+            value = _as_int(data[name])
+            if value is None or value < 0 or (upper is not None and value > upper):
+                return None
+            validated[name] = value
+    return validated
+
+
+def parse_submit_quiz(data):
+    """Validated data for SubmitQuizSerializer, or None to fall back to DRF"""
+    if not isinstance(data, dict):
+        return None
+    quiz_id = _as_int(data.get('quiz_id'))
+    responses = data.get('responses')
+    if quiz_id is None or not isinstance(responses, dict) or not _is_finite_json(responses):
+        return None
+    return {'quiz_id': quiz_id, 'responses': responses}
 
 class ProgressDashboardSerializer(serializers.Serializer):
     total_courses_enrolled = serializers.IntegerField()
@@ -0,0 +1,29 @@
+"""
+Progress cache invalidation signals
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import CourseProgress
+
+DASHBOARD_CACHE_TIMEOUT = 60  # short TTL bounds staleness from writes that bypass signals
+
+
+def dashboard_cache_key(user_id):
+    """Cache key for a user's serialized progress dashboard"""
+    return f"progress:dash:{user_id}"
+
+
+@receiver([post_save, post_delete], sender=CourseProgress)
+def invalidate_dashboard_cache(sender, instance, **kwargs):
+    """Drop the cached dashboard when one of the user's course rows changes.
+
+    The dashboard aggregates CourseProgress only, so lesson and quiz writes (the
+    high-frequency ones) leave the cached copy alone.
+
+    Deferred to commit so a dashboard read racing the write can't re-cache pre-commit data.
+    """
+    key = dashboard_cache_key(instance.user_id)
+    transaction.on_commit(lambda: cache.delete(key))
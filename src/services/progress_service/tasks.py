@@ -0,0 +1,48 @@
+"""
+Progress service background tasks
+"""
+import hashlib
+import logging
+
+from celery import shared_task
+
+from .models import CourseProgress
+from src.services.courses_service.models import Course
+from src.services.blockchain_service.models import Certificate
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def issue_certificate(course_progress_id):
+    """Create the pending blockchain Certificate for a completed course"""
+    course = CourseProgress.objects.select_related('user').get(pk=course_progress_id)
+    user = course.user
+    try:
+        course_name = Course.objects.only('title').get(id=course.course_id).title
+    except Course.DoesNotExist:
+        course_name = f"Course {course.course_id}"
+    
+    # Create certificate hash
+    cert_data = f"{user.id}_{course.course_id}_{course.completed_at.date()}"
+    certificate_hash = hashlib.sha256(cert_data.encode()).hexdigest()
+    
+    certificate, created = Certificate.objects.get_or_create(
+        user=user,
+        course_id=course.course_id,
+        defaults={
+            'course_name': course_name,
+            'completion_date': course.completed_at.date(),
+            'certificate_hash': certificate_hash,
+            'metadata': {
+                'completion_percentage': float(course.completion_percentage),
+                'tokens_earned': course.tokens_earned,
+                'average_quiz_score': float(course.average_quiz_score) if course.average_quiz_score else 0,
+                'total_time_hours': float(course.total_time_hours) if course.total_time_hours else 0,
+            },
+            'status': 'pending'
+        }
+    )
+    if created:
+        logger.info("Certificate created automatically: %s - %s", user.email, course_name)
+    return certificate.id
@@ -1,16 +1,23 @@
+import json
+from unittest import mock
 from django.test import TestCase
 from django.urls import reverse
+from django.core.management import call_command
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from .models import (
     LessonProgress, QuizAttempt, ModuleProgress,
     CourseProgress, ProgressSnapshot
 )
+from .serializers import UpdateLessonProgressSerializer, parse_lesson_progress
+from .tasks import issue_certificate
 
 User = get_user_model()
 
 class ProgressServiceTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = User.objects.create_user(email="progress@edu.com", username="progressor", password="pw123456")
         self.lesson = LessonProgress.objects.create(
@@ -87,3 +94,236 @@ class ProgressServiceTests(TestCase):
         self.assertEqual(r.status_code, 200)
         self.snapshot.refresh_from_db()
         self.assertEqual(self.snapshot.blockchain_event_tx_hash, "0xsnap")
+
+    def test_snapshot_progress_upserts_daily_row(self):
+        CourseProgress.objects.filter(pk=self.course.pk).update(lessons_completed=4)
+        call_command("snapshot_progress")
+        call_command("snapshot_progress")
+        snapshots = ProgressSnapshot.objects.filter(user=self.user, course_id=10)
+        self.assertEqual(snapshots.count(), 1)
+        self.assertEqual(snapshots.get().lessons_completed, 4)
+
+    def test_dashboard_cache_invalidated_on_write(self):
+        self.authenticate()
+        url = reverse("course-progress-dashboard")
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["data"]["courses_in_progress"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseProgress.objects.create(
+                user=self.user, course_id=11, course_title="Second Course", status="in_progress"
+            )
+        r2 = self.client.get(url)
+        self.assertEqual(r2.data["data"]["courses_in_progress"], 2)
+
+    def test_course_progress_with_computed(self):
+        LessonProgress.objects.create(
+            user=self.user, lesson_id=102, lesson_title="Second Lesson", course_id=10, module_id=2, status="completed"
+        )
+        course = CourseProgress.objects.with_computed(self.user).get(course_id=10)
+        self.assertEqual(course.computed_total_lessons, 2)
+        self.assertEqual(course.computed_lessons_completed, 1)
+        self.assertEqual(course.computed_quizzes_passed, 0)
+
+    def test_recompute_progress_updates_course_aggregates(self):
+        LessonProgress.objects.filter(pk=self.lesson.pk).update(status="completed")
+        call_command("recompute_progress", user_id=self.user.id)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.lessons_completed, 1)
+        self.assertEqual(self.course.completion_percentage, 100)
+
+    def test_mark_progress_completed_credits_tokens(self):
+        self.authenticate()
+        url = reverse("lesson-progress-mark-progress")
+        r = self.client.post(url, {"lesson_id": 101, "status": "completed"}, format="json")
+        self.assertEqual(r.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_balance, r.data["tokens_earned"])
+        self.assertGreater(self.user.token_balance, 0)
+
+    def test_lessons_by_course_is_paginated(self):
+        self.authenticate()
+        url = reverse("lesson-progress-by-course")
+        r = self.client.get(url, {"course_id": 10, "page_size": 1})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["pagination"]["count"], 1)
+        self.assertEqual(r.data["data"]["status"], "in_progress")
+        self.assertEqual(len(r.data["data"]["lessons"]), 1)
+        # A course summary, not a row list: no NDJSON form
+        r = self.client.get(url, {"course_id": 10, "format": "ndjson"})
+        self.assertEqual(r.status_code, 404)
+
+    def test_parse_lesson_progress_matches_serializer(self):
+        samples = [
+            {"lesson_id": 1, "status": "completed"},
+            {"lesson_id": "7", "status": "in_progress", "video_watched_percentage": 40, "time_spent_minutes": "3"},
+            {"lesson_id": 1, "status": "done"},
+            {"lesson_id": 1, "status": "completed", "video_watched_percentage": 101},
+            {"lesson_id": "1.5", "status": "completed"},
+            {"status": "completed"},
+            {"lesson_id": 1, "status": "completed", "time_spent_minutes": "\u0663"},
+            {"lesson_id": 1, "status": "completed", "video_watched_percentage": -1},
+            {"lesson_id": 1, "status": "completed", "time_spent_minutes": -5},
+            {"lesson_id": "\u00b2", "status": "completed"},
+            {"lesson_id": "9" * 5000, "status": "completed"},
+        ]
+        for data in samples:
+            fast = parse_lesson_progress(data)
+            serializer = UpdateLessonProgressSerializer(data=data)
+            if fast is not None:
+                self.assertTrue(serializer.is_valid())
+                self.assertEqual(fast, dict(serializer.validated_data))
+        self.assertIsNone(parse_lesson_progress({"lesson_id": 1, "status": "done"}))
+        for bad in samples[7:]:
+            self.assertIsNone(parse_lesson_progress(bad))
+            self.assertFalse(UpdateLessonProgressSerializer(data=bad).is_valid())
+
+    def test_mark_progress_rejects_bad_ints_with_400(self):
+        self.authenticate()
+        url = reverse("lesson-progress-mark-progress")
+        for data in ({"lesson_id": "\u00b2", "status": "completed"},
+                     {"lesson_id": "9" * 5000, "status": "completed"}):
+            self.assertEqual(self.client.post(url, data, format="json").status_code, 400)
+
+    def create_lesson(self):
+        from src.services.courses_service.models import CourseCategory, Course, Module, Lesson
+        cat = CourseCategory.objects.create(name="Chain", slug="chain", description="Test")
+        course = Course.objects.create(
+            title="Chain 101", slug="chain-101", description="desc", category=cat,
+            instructor=self.user, access_type="free", created_by=self.user, status="published"
+        )
+        module = Module.objects.create(course=course, title="M1", order=1)
+        return Lesson.objects.create(module=module, title="L1", content_type="video", order=1)
+
+    def test_mark_progress_creates_row_from_lesson(self):
+        lesson = self.create_lesson()
+        course, module = lesson.module.course, lesson.module
+        self.authenticate()
+        url = reverse("lesson-progress-mark-progress")
+        r = self.client.post(url, {"lesson_id": lesson.id, "status": "in_progress"}, format="json")
+        self.assertEqual(r.status_code, 200)
+        progress = LessonProgress.objects.get(user=self.user, lesson_id=lesson.id)
+        self.assertEqual((progress.course_id, progress.module_id), (course.id, module.id))
+        self.assertIsNotNone(progress.started_at)
+
+    def test_quiz_history_cursor_pagination(self):
+        for n in (2, 3):
+            QuizAttempt.objects.create(
+                user=self.user, lesson_id=101, quiz_id=999, quiz_title="Quiz One", course_id=10, attempt_number=n
+            )
+        self.authenticate()
+        r = self.client.get(reverse("quiz-attempts-history"), {"page_size": 2})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.data["data"]), 2)
+        self.assertIsNotNone(r.data["pagination"]["next"])
+        r2 = self.client.get(r.data["pagination"]["next"])
+        self.assertEqual(len(r2.data["data"]), 1)
+        seen = {a["id"] for a in r.data["data"]} | {a["id"] for a in r2.data["data"]}
+        self.assertEqual(len(seen), 3)
+
+    def test_quiz_history_streams_ndjson_when_asked(self):
+        self.authenticate()
+        r = self.client.get(reverse("quiz-attempts-history"), {"page_size": 1}, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(r.streaming_content).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.quiz.id])
+        self.assertEqual(rows[0]["percentage_score"], "60.00")
+        # Plain JSON clients keep the paginated envelope
+        r = self.client.get(reverse("quiz-attempts-history"))
+        self.assertEqual(r["Content-Type"], "application/json")
+        self.assertIn("pagination", r.json())
+
+    def test_snapshot_by_course_exports_ndjson_via_format_param(self):
+        self.authenticate()
+        url = reverse("progress-snapshots-by-course")
+        r = self.client.get(url, {"course_id": 10, "format": "ndjson"})
+        rows = [json.loads(line) for line in b"".join(r.streaming_content).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.snapshot.id])
+        # Errors still render, as a single NDJSON line
+        r = self.client.get(url, {"format": "ndjson"})
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(len(r.content.splitlines()), 1)
+
+    def test_submit_quiz_scores_and_records_attempt(self):
+        from src.services.courses_service.models import Quiz, Question, Answer
+        lesson = self.create_lesson()
+        quiz = Quiz.objects.create(lesson=lesson, title="Chain Quiz", passing_score=50)
+        mc = Question.objects.create(quiz=quiz, question_type="multiple_choice", text="Pick", order=1, points=2)
+        right = Answer.objects.create(question=mc, text="A", is_correct=True, order=1)
+        Answer.objects.create(question=mc, text="B", is_correct=False, order=2)
+        tf = Question.objects.create(quiz=quiz, question_type="true_false", text="True?", order=2, points=1)
+        Answer.objects.create(question=tf, text="True", is_correct=True, order=1)
+        self.authenticate()
+        url = reverse("quiz-attempts-submit-quiz")
+        r = self.client.post(url, {"quiz_id": quiz.id, "responses": {str(mc.id): right.id, str(tf.id): "false"}}, format="json")
+        self.assertEqual(r.status_code, 201)
+        self.assertTrue(r.data["is_passed"])
+        attempt = QuizAttempt.objects.get(pk=r.data["data"]["id"])
+        self.assertEqual((attempt.points_earned, attempt.total_points), (2, 3))
+        self.assertEqual((attempt.lesson_id, attempt.course_id), (lesson.id, lesson.module.course_id))
+        self.assertEqual(attempt.question_responses.filter(is_correct=True).count(), 1)
+        self.assertEqual(r.data["data"]["points_earned"], 2)
+        r2 = self.client.post(url + "?verbose=1", {"quiz_id": quiz.id, "responses": {}}, format="json")
+        self.assertEqual(r2.data["data"]["attempt_number"], 2)
+        self.assertEqual(len(r2.data["data"]["question_responses"]), 2)
+        self.assertTrue(all(qr["id"] for qr in r2.data["data"]["question_responses"]))
+
+    def test_my_courses_pages_by_recent_activity(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        for course_id in (11, 12):
+            CourseProgress.objects.create(user=self.user, course_id=course_id, course_title=f"Course {course_id}")
+        # Tied updated_at values still page deterministically, broken by id
+        now = timezone.now()
+        CourseProgress.objects.filter(user=self.user).update(updated_at=now)
+        newest = CourseProgress.objects.filter(user=self.user).order_by("id").first()
+        CourseProgress.objects.filter(pk=newest.pk).update(updated_at=now + timedelta(minutes=1))
+        self.authenticate()
+        r = self.client.get(reverse("course-progress-my-courses"), {"page_size": 2})
+        self.assertNotIn("count", r.data["pagination"])
+        r2 = self.client.get(r.data["pagination"]["next"])
+        ids = [c["id"] for c in r.data["data"] + r2.data["data"]]
+        others = CourseProgress.objects.filter(user=self.user).exclude(pk=newest.pk).order_by("-id")
+        self.assertEqual(ids, [newest.pk, *others.values_list("id", flat=True)])
+        # The generic list keeps the page-number envelope
+        r = self.client.get(reverse("course-progress-list"))
+        self.assertEqual(r.data["pagination"]["count"], 3)
+
+    def test_submit_quiz_rejects_overflowing_answer(self):
+        from .views import score_multiple_choice
+        question = mock.Mock(points=1)
+        self.assertEqual(score_multiple_choice(question, float("inf"), {1: ("A", True)}), 0)
+        self.authenticate()
+        body = '{"quiz_id": 1, "responses": {"1": 1e999}}'
+        r = self.client.post(reverse("quiz-attempts-submit-quiz"), body, content_type="application/json")
+        self.assertEqual(r.status_code, 400)
+
+    def test_submit_quiz_rejects_non_dict_responses(self):
+        self.authenticate()
+        url = reverse("quiz-attempts-submit-quiz")
+        for responses in ([1, 2], "1", None):
+            r = self.client.post(url, {"quiz_id": 1, "responses": responses}, format="json")
+            self.assertEqual(r.status_code, 400, responses)
+
+    def test_course_list_defers_unserialized_columns(self):
+        self.authenticate()
+        with self.assertNumQueries(2):  # COUNT and the page; no per-row deferred loads
+            r = self.client.get(reverse("course-progress-list"))
+        self.assertEqual(r.status_code, 200)
+
+    def test_certificate_enqueue_failure_is_logged_not_raised(self):
+        from .views import enqueue_certificate
+        with mock.patch.object(issue_certificate, "delay", side_effect=ConnectionError("broker down")):
+            with self.assertLogs("src.services.progress_service.views", level="ERROR"):
+                enqueue_certificate(self.course.pk)
+
+    def test_issue_certificate_task_creates_pending_certificate(self):
+        from django.utils import timezone
+        from src.services.blockchain_service.models import Certificate
+        CourseProgress.objects.filter(pk=self.course.pk).update(status="completed", completed_at=timezone.now())
+        certificate_id = issue_certificate(self.course.pk)
+        certificate = Certificate.objects.get(pk=certificate_id)
+        self.assertEqual(certificate.status, "pending")
+        self.assertEqual(certificate.course_name, "Course 10")
+        self.assertEqual(issue_certificate(self.course.pk), certificate_id)
@@ -1,10 +1,18 @@
-from rest_framework import viewsets, status
+from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Avg, Count, Q
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Avg, Count, Max, Q, F, Prefetch
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from collections import defaultdict
 from datetime import timedelta
+import json
 import logging
 
 from .models import (
@@ -14,266 +22,388 @@ from .models import (
 from .serializers import (
     LessonProgressSerializer, QuizAttemptSerializer, QuestionResponseSerializer,
     ModuleProgressSerializer, CourseProgressSerializer, ProgressSnapshotSerializer,
-    UpdateLessonProgressSerializer, SubmitQuizSerializer, ProgressDashboardSerializer
+    UpdateLessonProgressSerializer, SubmitQuizSerializer, ProgressDashboardSerializer,
+    parse_lesson_progress, parse_submit_quiz
 )
+from .signals import dashboard_cache_key, DASHBOARD_CACHE_TIMEOUT
+from .tasks import issue_certificate
+from src.services.courses_service.models import Lesson, Quiz, Question, Answer
 from src.shared.exceptions import ValidationError, ResourceNotFoundError
 from src.shared.constants import TOKEN_REWARDS
+from src.shared.decorators import retry_on_db_error
+from src.shared.pagination import StandardCursorPagination
+from src.shared.renderers import NDJSONRenderer
 
+User = get_user_model()
 logger = logging.getLogger(__name__)
 
-class LessonProgressViewSet(viewsets.ModelViewSet):
+LESSON_REWARD = TOKEN_REWARDS.get('LESSON_COMPLETE', 5)
+QUIZ_REWARD = TOKEN_REWARDS.get('QUIZ_COMPLETE', 20)
+COURSE_REWARD = TOKEN_REWARDS.get('COURSE_COMPLETE', 100)
+
+
+def lock_user(user):
+    """Serialize one user's concurrent reward/attempt writes on their user row (SELECT ... FOR UPDATE)"""
+    list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+
+def credit_tokens(user, amount):
+    """Add tokens with a single-column UPDATE evaluated in the database (no user.save())"""
+    User.objects.filter(pk=user.pk).update(token_balance=F('token_balance') + amount)
+
+def enqueue_certificate(course_progress_id):
+    """on_commit hook: a broker outage is logged, not raised, since the completion already committed"""
+    try:
+        issue_certificate.delay(course_progress_id)
+    except Exception:
+        logger.exception("Could not queue certificate for course progress %s", course_progress_id)
+
+def serializer_columns(serializer_class):
+    """Model columns a serializer emits, for .only() on list endpoints (keeps both in sync)"""
+    model = serializer_class.Meta.model
+    concrete = {f.name for f in model._meta.concrete_fields}
+    return [name for name in serializer_class.Meta.fields if name in concrete]
+
+# Lists that can also be exported whole as NDJSON (Accept: application/x-ndjson or ?format=ndjson)
+NDJSON_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+def wants_json_lines(request):
+    return request.accepted_renderer.format == NDJSONRenderer.format
+
+def stream_json_lines(queryset, serializer, chunk_size=500):
+    """Unpaginated NDJSON export off a server-side cursor, so memory stays O(chunk_size)"""
+    def rows():
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield json.dumps(serializer.to_representation(obj), cls=JSONEncoder) + '\n'
+    return StreamingHttpResponse(rows(), content_type='application/x-ndjson')
+
+# Quiz scorers: points earned for one answer, given the question's answers as
+# {answer_id: (text, is_correct)}, so scoring issues no queries. Dispatched on question_type via QUIZ_SCORERS.
+def score_multiple_choice(question, user_answer, answers):
+    try:
+        answer_id = int(user_answer)
+    except (ValueError, TypeError, OverflowError):  # OverflowError: JSON 1e999 parses to inf
+        return 0
+    _, is_correct = answers.get(answer_id, (None, False))
+    return question.points if is_correct else 0
+
+def score_true_false(question, user_answer, answers):
+    correct_text = next((text for text, correct in answers.values() if correct), None)
+    if correct_text is not None and user_answer and str(user_answer).lower() == str(correct_text).lower():
+        return question.points
+    return 0
+
+def score_open_answer(question, user_answer, answers):
+    # For other types, assume correct for now (can be enhanced later)
+    return question.points
+
+QUIZ_SCORERS = {
+    'multiple_choice': score_multiple_choice,
+    'true_false': score_true_false,
+}
+
+class BlockchainCallbackMixin:
+    """Shared blockchain_callback action for progress models with blockchain event columns"""
+    callback_fields = ['blockchain_event_tx_hash', 'last_blockchain_status']
+    @action(detail=True, methods=['post'])
+    def blockchain_callback(self, request, pk=None):
+        """Receive blockchain event callback (tx_hash, message)"""
+        obj = self.get_object()
+        obj.blockchain_event_tx_hash = request.data.get('tx_hash')
+        obj.last_blockchain_status = request.data.get('message', '')
+        update_fields = list(self.callback_fields)
+        if any(f.name == 'updated_at' for f in obj._meta.concrete_fields):
+            update_fields.append('updated_at')  # auto_now only advances if listed
+        obj.save(update_fields=update_fields)
+        return Response({'status': 'success', 'updated': True})
+
+class NarrowListMixin:
+    """Fetch only the serializer's columns for the list action; detail/write actions keep full rows"""
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list':
+            queryset = queryset.only(*serializer_columns(self.get_serializer_class()))
+        return queryset
+
+class LessonProgressViewSet(BlockchainCallbackMixin, NarrowListMixin, mixins.ListModelMixin,
+                            mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
+    """Rows are created by mark_progress; clients may read and adjust them"""
     serializer_class = LessonProgressSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
         return LessonProgress.objects.filter(user=self.request.user)
     @action(detail=False, methods=['post'])
+    @retry_on_db_error()
     def mark_progress(self, request):
-        serializer = UpdateLessonProgressSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        lesson_id = serializer.validated_data['lesson_id']
-        status_val = serializer.validated_data['status']
-        video_watched = serializer.validated_data.get('video_watched_percentage', 0)
-        time_spent = serializer.validated_data.get('time_spent_minutes', 0)
+        validated = parse_lesson_progress(request.data)
+        if validated is None:
+            serializer = UpdateLessonProgressSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            validated = serializer.validated_data
+        lesson_id = validated['lesson_id']
+        status_val = validated['status']
+        video_watched = validated.get('video_watched_percentage', 0)
+        time_spent = validated.get('time_spent_minutes', 0)
         try:
-            # Get lesson details for title
-            from src.services.courses_service.models import Lesson
-            try:
-                lesson = Lesson.objects.get(id=lesson_id)
-                lesson_title = lesson.title
-                course_id_val = lesson.module.course_id
-                module_id_val = lesson.module.id
-            except Lesson.DoesNotExist:
-                lesson_title = f'Lesson {lesson_id}'
-                course_id_val = serializer.validated_data.get('course_id')
-                module_id_val = None
-            
-            progress, created = LessonProgress.objects.get_or_create(
-                user=request.user,
-                lesson_id=lesson_id,
-                defaults={
-                    'lesson_title': lesson_title,
-                    'course_id': course_id_val or serializer.validated_data.get('course_id'),
-                    'module_id': module_id_val
-                }
-            )
-            progress.status = status_val
-            progress.video_watched_percentage = video_watched
-            progress.time_spent_minutes = time_spent
-            if status_val == 'in_progress' and not progress.started_at:
-                progress.started_at = timezone.now()
-            if status_val == 'completed' and not progress.completed_at:
-                progress.completed_at = timezone.now()
-                progress.tokens_earned = TOKEN_REWARDS.get('LESSON_COMPLETE', 5)
-                request.user.token_balance += progress.tokens_earned
-                request.user.save()
-            progress.save()
-            logger.info(
-                f"Lesson progress updated: {request.user.email} - "
-                f"Lesson {lesson_id} - {status_val}"
-            )
-            return Response({
-                'status': 'success',
-                'message': f'Lesson marked as {status_val}',
-                'data': LessonProgressSerializer(progress).data,
-                'tokens_earned': progress.tokens_earned,
-            })
-        except Exception as e:
-            logger.error(f"Error updating lesson progress: {str(e)}")
-            raise ValidationError(str(e))
-    @action(detail=True, methods=['post'])
-    def blockchain_callback(self, request, pk=None):
-        """Receive blockchain event callback (tx_hash, message)"""
-        progress = self.get_object()
-        tx_hash = request.data.get('tx_hash')
-        message = request.data.get('message', '')
-        progress.blockchain_event_tx_hash = tx_hash
-        progress.last_blockchain_status = message
-        progress.save()
-        return Response({'status': 'success', 'updated': True})
+            with transaction.atomic():
+                # Also covers the first write, when there is no progress row to lock yet
+                lock_user(request.user)
+                # Lock the existing row (if any) so a repeated "completed" can't credit twice
+                progress = LessonProgress.objects.select_for_update().filter(
+                    user=request.user, lesson_id=lesson_id
+                ).first()
+                created = progress is None
+                if created:
+                    # Lesson details are only needed for the first write
+                    try:
+                        lesson = Lesson.objects.select_related('module').only(
+                            'title', 'module__id', 'module__course_id'
+                        ).get(id=lesson_id)
+                        lesson_title = lesson.title
+                        course_id_val = lesson.module.course_id
+                        module_id_val = lesson.module.id
+                    except Lesson.DoesNotExist:
+                        lesson_title = f'Lesson {lesson_id}'
+                        course_id_val = validated.get('course_id')
+                        module_id_val = None
+                    progress = LessonProgress(
+                        user=request.user,
+                        lesson_id=lesson_id,
+                        lesson_title=lesson_title,
+                        course_id=course_id_val or validated.get('course_id'),
+                        module_id=module_id_val
+                    )
+                # Track the columns that actually change so heartbeats write as little as possible
+                dirty = []
+                for field, value in (
+                    ('status', status_val),
+                    ('video_watched_percentage', video_watched),
+                    ('time_spent_minutes', time_spent),
+                ):
+                    if getattr(progress, field) != value:
+                        setattr(progress, field, value)
+                        dirty.append(field)
+                if status_val == 'in_progress' and not progress.started_at:
+                    progress.started_at = timezone.now()
+                    dirty.append('started_at')
+                if status_val == 'completed' and not progress.completed_at:
+                    progress.completed_at = timezone.now()
+                    progress.tokens_earned = LESSON_REWARD
+                    credit_tokens(request.user, progress.tokens_earned)
+                    dirty += ['completed_at', 'tokens_earned']
+                if created:
+                    progress.save(force_insert=True)
+                elif dirty:
+                    progress.save(update_fields=dirty)
+        except IntegrityError as e:
+            # e.g. a lesson unknown to the catalogue has no module to attach the row to
+            logger.warning("Could not record lesson progress: %s", e)
+            raise ValidationError("Could not record progress for this lesson")
+        logger.info(
+            "Lesson progress updated: %s - Lesson %s - %s",
+            request.user.email, lesson_id, status_val
+        )
+        return Response({
+            'status': 'success',
+            'message': f'Lesson marked as {status_val}',
+            'data': self.get_serializer(progress).data,
+            'tokens_earned': progress.tokens_earned,
+        })
     @action(detail=False, methods=['get'])
     def by_course(self, request):
         course_id = request.query_params.get('course_id')
         if not course_id:
             raise ValidationError("course_id parameter required")
         
-        lessons = self.get_queryset().filter(course_id=course_id)
-        serializer = self.get_serializer(lessons, many=True)
+        lessons = self.get_queryset().filter(course_id=course_id).only(
+            *serializer_columns(LessonProgressSerializer)
+        ).order_by('-completed_at')
+        # Bound the lesson list; the summary below still covers the whole course
+        page = self.paginate_queryset(lessons)
+        serializer = self.get_serializer(page if page is not None else list(lessons), many=True)
         
         # Also get course progress summary
-        from .models import CourseProgress
         try:
             course_progress = CourseProgress.objects.get(user=request.user, course_id=course_id)
-            return Response({
-                'status': 'success',
-                'data': {
-                    'completion_percentage': float(course_progress.completion_percentage),
-                    'lessons_completed': course_progress.lessons_completed,
-                    'status': course_progress.status,
-                    'lessons': serializer.data
-                }
-            })
+            data = {
+                'completion_percentage': float(course_progress.completion_percentage),
+                'lessons_completed': course_progress.lessons_completed,
+                'status': course_progress.status,
+                'lessons': serializer.data
+            }
         except CourseProgress.DoesNotExist:
             # Calculate from lesson progress
-            completed_count = lessons.filter(status='completed').count()
-            total_count = lessons.count()
+            counts = lessons.aggregate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(status='completed'))
+            )
+            completed_count = counts['completed']
+            total_count = counts['total']
             completion = (completed_count / total_count * 100) if total_count > 0 else 0
-            
-            return Response({
-                'status': 'success',
-                'data': {
-                    'completion_percentage': completion,
-                    'lessons_completed': completed_count,
-                    'status': 'enrolled',
-                    'lessons': serializer.data
-                }
-            })
+            data = {
+                'completion_percentage': completion,
+                'lessons_completed': completed_count,
+                'status': 'enrolled',
+                'lessons': serializer.data
+            }
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response({'status': 'success', 'data': data})
 
-class QuizAttemptViewSet(viewsets.ModelViewSet):
+class QuizAttemptViewSet(BlockchainCallbackMixin, NarrowListMixin, mixins.ListModelMixin,
+                         mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Attempts are created only by submit_quiz and never edited by clients"""
     serializer_class = QuizAttemptSerializer
     permission_classes = [IsAuthenticated]
+    # history pages by cursor; started_at is set on insert and never null, unlike completed_at
+    cursor_ordering = '-started_at'
     def get_queryset(self):
-        return QuizAttempt.objects.filter(user=self.request.user)
+        return QuizAttempt.objects.filter(user=self.request.user).prefetch_related(
+            Prefetch(
+                'question_responses',
+                queryset=QuestionResponse.objects.order_by('question_id').only(
+                    'id', 'quiz_attempt_id', 'question_id', 'question_text', 'question_type',
+                    'user_response', 'is_correct', 'points_earned', 'feedback'
+                ),
+                to_attr='prefetched_responses'
+            )
+        )
     @action(detail=False, methods=['post'])
+    @retry_on_db_error()
     def submit_quiz(self, request):
-        serializer = SubmitQuizSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        quiz_id = serializer.validated_data['quiz_id']
-        responses = serializer.validated_data['responses']
-        try:
-            attempt_count = self.get_queryset().filter(quiz_id=quiz_id).count() + 1
-            attempt = QuizAttempt.objects.create(
+        validated = parse_submit_quiz(request.data)
+        if validated is None:
+            serializer = SubmitQuizSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            validated = serializer.validated_data
+        quiz_id = validated['quiz_id']
+        responses = validated['responses']
+        with transaction.atomic():
+            # Concurrent submissions would otherwise read the same MAX(attempt_number)
+            lock_user(request.user)
+            last_attempt = QuizAttempt.objects.filter(
+                user=request.user, quiz_id=quiz_id
+            ).aggregate(m=Max('attempt_number'))['m']
+            attempt_count = (last_attempt or 0) + 1
+            # Get quiz and questions
+            try:
+                quiz = Quiz.objects.select_related('lesson__module').get(id=quiz_id)
+            except Quiz.DoesNotExist:
+                raise ResourceNotFoundError("Quiz not found")
+            # Built in memory and inserted once, after scoring
+            attempt = QuizAttempt(
                 user=request.user,
+                lesson_id=quiz.lesson_id,
+                course_id=quiz.lesson.module.course_id,
                 quiz_id=quiz_id,
-                quiz_title=f'Quiz {quiz_id}',
+                quiz_title=quiz.title,
+                passing_score=quiz.passing_score,
                 attempt_number=attempt_count,
                 status='submitted',
                 responses=responses,
             )
-            # Get quiz and questions
-            from src.services.courses_service.models import Quiz, Question, Answer
-            try:
-                quiz = Quiz.objects.get(id=quiz_id)
-                attempt.quiz_title = quiz.title
-                attempt.passing_score = quiz.passing_score
-            except Quiz.DoesNotExist:
-                raise ResourceNotFoundError("Quiz not found")
-            
+        
             questions = Question.objects.filter(quiz_id=quiz_id).order_by('order')
-            total_points = 0
-            points_earned = 0
-            
+            # {question_id: {answer_id: (text, is_correct)}} in one query, without building Answer instances
+            answers_by_qid = defaultdict(dict)
+            for question_id, answer_id, text, is_correct in Answer.objects.filter(
+                question__quiz_id=quiz_id
+            ).values_list('question_id', 'id', 'text', 'is_correct'):
+                answers_by_qid[question_id][answer_id] = (text, is_correct)
+            # Score first, then reduce and build rows from the scored list
+            scored = []
+            append, get_response, scorer_for = scored.append, responses.get, QUIZ_SCORERS.get
             for question in questions:
-                question_id_str = str(question.id)
-                user_answer = responses.get(question_id_str)
-                total_points += question.points
-                
-                # Score the answer and create response
-                question_points_earned = 0
-                is_correct = False
-                
-                if question.question_type == 'multiple_choice':
-                    try:
-                        answer_obj = Answer.objects.get(id=int(user_answer), question=question)
-                        if answer_obj.is_correct:
-                            question_points_earned = question.points
-                            points_earned += question.points
-                            is_correct = True
-                    except (Answer.DoesNotExist, ValueError, TypeError):
-                        pass
-                elif question.question_type == 'true_false':
-                    correct_answer = Answer.objects.filter(question=question, is_correct=True).first()
-                    if correct_answer and user_answer and str(user_answer).lower() == str(correct_answer.text).lower():
-                        question_points_earned = question.points
-                        points_earned += question.points
-                        is_correct = True
-                else:
-                    # For other types, assume correct for now (can be enhanced later)
-                    question_points_earned = question.points
-                    points_earned += question.points
-                    is_correct = True
-                
-                QuestionResponse.objects.create(
+                user_answer = get_response(str(question.id))
+                score = scorer_for(question.question_type, score_open_answer)
+                append((question, user_answer, score(question, user_answer, answers_by_qid[question.id])))
+            total_points = sum(question.points for question, _, _ in scored)
+            points_earned = sum(points for _, _, points in scored)
+            qr_objs = [
+                QuestionResponse(
                     quiz_attempt=attempt,
                     question_id=question.id,
                     question_text=question.text,
                     question_type=question.question_type,
                     user_response=str(user_answer) if user_answer else '',
                     points_possible=question.points,
-                    points_earned=question_points_earned,
-                    is_correct=is_correct,
+                    points_earned=points,
+                    is_correct=points > 0,
                 )
+                for question, user_answer, points in scored
+            ]
             attempt.total_points = total_points
             attempt.points_earned = points_earned
             attempt.percentage_score = (points_earned / total_points * 100) if total_points > 0 else 0
             attempt.completed_at = timezone.now()
             attempt.is_passed = attempt.percentage_score >= attempt.passing_score
             if attempt.is_passed:
-                attempt.tokens_earned = TOKEN_REWARDS.get('QUIZ_COMPLETE', 20)
-                request.user.token_balance += attempt.tokens_earned
-                request.user.save()
-            attempt.save()
-            logger.info(
-                f"Quiz submitted: {request.user.email} - Quiz {quiz_id} - "
-                f"Score: {attempt.percentage_score}% - Passed: {attempt.is_passed}"
-            )
-            return Response({
-                'status': 'success',
-                'message': 'Quiz submitted successfully',
-                'data': QuizAttemptSerializer(attempt).data,
+                attempt.tokens_earned = QUIZ_REWARD
+                credit_tokens(request.user, attempt.tokens_earned)
+            attempt.save(force_insert=True)
+            QuestionResponse.objects.bulk_create(qr_objs, batch_size=500)
+            # Serialize the rows just inserted instead of reading them back (same order as the prefetch)
+            attempt.prefetched_responses = sorted(qr_objs, key=lambda qr: qr.question_id)
+        logger.info(
+            "Quiz submitted: %s - Quiz %s - Score: %s%% - Passed: %s",
+            request.user.email, quiz_id, attempt.percentage_score, attempt.is_passed
+        )
+        if request.query_params.get('verbose') == '1':
+            # Full canonical shape, including the per-question responses
+            data = self.get_serializer(attempt).data
+        else:
+            data = {
+                'id': attempt.id,
+                'quiz_id': attempt.quiz_id,
+                'quiz_title': attempt.quiz_title,
+                'attempt_number': attempt.attempt_number,
+                'total_points': total_points,
+                'points_earned': points_earned,
+                'percentage_score': f"{attempt.percentage_score:.2f}",  # same string form as the serializer
                 'is_passed': attempt.is_passed,
                 'tokens_earned': attempt.tokens_earned,
-            }, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            logger.error(f"Error submitting quiz: {str(e)}")
-            raise ValidationError(str(e))
-    @action(detail=True, methods=['post'])
-    def blockchain_callback(self, request, pk=None):
-        attempt = self.get_object()
-        tx_hash = request.data.get('tx_hash')
-        message = request.data.get('message', '')
-        attempt.blockchain_event_tx_hash = tx_hash
-        attempt.last_blockchain_status = message
-        attempt.save()
-        return Response({'status': 'success', 'updated': True})
-    @action(detail=False, methods=['get'])
+            }
+        return Response({
+            'status': 'success',
+            'message': 'Quiz submitted successfully',
+            'data': data,
+            'is_passed': attempt.is_passed,
+            'tokens_earned': attempt.tokens_earned,
+        }, status=status.HTTP_201_CREATED)
+    @action(detail=False, methods=['get'], renderer_classes=NDJSON_RENDERERS,
+            pagination_class=StandardCursorPagination)
     def history(self, request):
         quiz_id = request.query_params.get('quiz_id')
         attempts = self.get_queryset()
         if quiz_id:
             attempts = attempts.filter(quiz_id=quiz_id)
-        attempts = attempts.order_by('-completed_at')
+        attempts = attempts.only(*serializer_columns(QuizAttemptSerializer)).order_by(self.cursor_ordering)
+        if wants_json_lines(request):
+            return stream_json_lines(attempts, self.get_serializer())
         page = self.paginate_queryset(attempts)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(attempts, many=True)
         return Response({'status': 'success', 'data': serializer.data})
-    def _score_question(self, question_id, answer):
-        return 1 if answer else 0
 
-class ModuleProgressViewSet(viewsets.ModelViewSet):
+class ModuleProgressViewSet(BlockchainCallbackMixin, NarrowListMixin, mixins.ListModelMixin,
+                            mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     serializer_class = ModuleProgressSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
         return ModuleProgress.objects.filter(user=self.request.user)
-    @action(detail=True, methods=['post'])
-    def blockchain_callback(self, request, pk=None):
-        progress = self.get_object()
-        tx_hash = request.data.get('tx_hash')
-        message = request.data.get('message', '')
-        progress.blockchain_event_tx_hash = tx_hash
-        progress.last_blockchain_status = message
-        progress.save()
-        return Response({'status': 'success', 'updated': True})
 
-class CourseProgressViewSet(viewsets.ModelViewSet):
+class CourseProgressViewSet(BlockchainCallbackMixin, NarrowListMixin, mixins.ListModelMixin,
+                            mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     serializer_class = CourseProgressSerializer
     permission_classes = [IsAuthenticated]
+    # my_courses pages by cursor in recent-activity order; id breaks updated_at ties
+    cursor_ordering = ('-updated_at', '-id')
     def get_queryset(self):
         return CourseProgress.objects.filter(user=self.request.user)
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], pagination_class=StandardCursorPagination)
     def my_courses(self, request):
-        courses = self.get_queryset().order_by('-updated_at')
+        courses = self.get_queryset().only(*serializer_columns(CourseProgressSerializer)).order_by(*self.cursor_ordering)
         page = self.paginate_queryset(courses)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -282,112 +412,90 @@ class CourseProgressViewSet(viewsets.ModelViewSet):
         return Response({'status': 'success', 'data': serializer.data})
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
+        data = cache.get_or_set(
+            dashboard_cache_key(request.user.id),
+            self._build_dashboard,
+            DASHBOARD_CACHE_TIMEOUT
+        )
+        return Response({'status': 'success', 'data': data})
+    def _build_dashboard(self):
         all_courses = self.get_queryset()
+        # One pass over the user's course rows instead of a query per figure
+        stats = all_courses.aggregate(
+            enrolled=Count('id', filter=Q(status='enrolled')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            completed=Count('id', filter=Q(status='completed')),
+            overall=Avg('completion_percentage'),
+            tokens=Sum('tokens_earned'),
+            hours=Sum('total_time_hours'),
+            avg_quiz=Avg('average_quiz_score'),
+        )
         dashboard_data = {
-            'total_courses_enrolled': all_courses.filter(status='enrolled').count(),
-            'courses_in_progress': all_courses.filter(status='in_progress').count(),
-            'courses_completed': all_courses.filter(status='completed').count(),
-            'overall_completion': all_courses.aggregate(Avg('completion_percentage'))['completion_percentage__avg'] or 0,
-            'total_tokens_earned': all_courses.aggregate(Sum('tokens_earned'))['tokens_earned__sum'] or 0,
-            'total_time_hours': all_courses.aggregate(Sum('total_time_hours'))['total_time_hours__sum'] or 0,
-            'average_quiz_score': all_courses.aggregate(Avg('average_quiz_score'))['average_quiz_score__avg'] or 0,
+            'total_courses_enrolled': stats['enrolled'],
+            'courses_in_progress': stats['in_progress'],
+            'courses_completed': stats['completed'],
+            'overall_completion': stats['overall'] or 0,
+            'total_tokens_earned': stats['tokens'] or 0,
+            'total_time_hours': stats['hours'] or 0,
+            'average_quiz_score': stats['avg_quiz'] or 0,
         }
-        current = all_courses.filter(status='in_progress').first()
+        current = all_courses.filter(status='in_progress').order_by('-updated_at').first()
         if current:
-            dashboard_data['current_course'] = CourseProgressSerializer(current).data
-        serializer = ProgressDashboardSerializer(dashboard_data)
-        return Response({'status': 'success', 'data': serializer.data})
+            dashboard_data['current_course'] = current
+        return ProgressDashboardSerializer(dashboard_data).data
     @action(detail=True, methods=['post'])
     def mark_complete(self, request, pk=None):
         try:
             course = self.get_object()
         except CourseProgress.DoesNotExist:
             raise ResourceNotFoundError("Course not found")
-        course.status = 'completed'
-        course.completed_at = timezone.now()
-        course.completion_percentage = 100
-        course.tokens_earned += TOKEN_REWARDS.get('COURSE_COMPLETE', 100)
-        request.user.token_balance += TOKEN_REWARDS.get('COURSE_COMPLETE', 100)
-        request.user.save()
-        course.certificate_issued = True
-        course.certificate_issued_at = timezone.now()
-        course.save()
-        
-        # Issue blockchain certificate automatically
-        from src.services.blockchain_service.models import Certificate
-        import hashlib
-        
-        try:
-            # Get course details
-            from src.services.courses_service.models import Course
-            course_obj = Course.objects.get(id=course.course_id)
-            course_name = course_obj.title
-        except Course.DoesNotExist:
-            course_name = f"Course {course.course_id}"
-        
-        # Create certificate hash
-        cert_data = f"{request.user.id}_{course.course_id}_{course.completed_at.date()}"
-        certificate_hash = hashlib.sha256(cert_data.encode()).hexdigest()
-        
-        # Create certificate record
-        certificate, created = Certificate.objects.get_or_create(
-            user=request.user,
-            course_id=course.course_id,
-            defaults={
-                'course_name': course_name,
-                'completion_date': course.completed_at.date(),
-                'certificate_hash': certificate_hash,
-                'metadata': {
-                    'completion_percentage': float(course.completion_percentage),
-                    'tokens_earned': course.tokens_earned,
-                    'average_quiz_score': float(course.average_quiz_score) if course.average_quiz_score else 0,
-                    'total_time_hours': float(course.total_time_hours) if course.total_time_hours else 0,
-                },
-                'status': 'pending'
-            }
-        )
+        with transaction.atomic():
+            lock_user(request.user)
+            # Re-read under the lock so a concurrent completion's total isn't overwritten
+            course.refresh_from_db(fields=['tokens_earned'])
+            course.status = 'completed'
+            course.completed_at = timezone.now()
+            course.completion_percentage = 100
+            course.tokens_earned += COURSE_REWARD
+            credit_tokens(request.user, COURSE_REWARD)
+            course.certificate_issued = True
+            course.certificate_issued_at = timezone.now()
+            course.save(update_fields=[
+                'status', 'completed_at', 'completion_percentage', 'tokens_earned',
+                'certificate_issued', 'certificate_issued_at', 'updated_at'
+            ])
+            # Certificate hashing and creation run in the worker once this commits
+            transaction.on_commit(lambda: enqueue_certificate(course.pk))
         
-        logger.info(f"Course completed: {request.user.email} - Course {course.course_id}")
-        if created:
-            logger.info(f"Certificate created automatically: {request.user.email} - {course_name}")
+        logger.info("Course completed: %s - Course %s", request.user.email, course.course_id)
         
         return Response({
             'status': 'success',
             'message': 'Course marked as completed!',
-            'data': CourseProgressSerializer(course).data,
-            'tokens_earned': TOKEN_REWARDS.get('COURSE_COMPLETE', 100),
+            'data': self.get_serializer(course).data,
+            'tokens_earned': COURSE_REWARD,
             'certificate_issued': True,
-            'certificate_id': certificate.id
+            'certificate_status': 'pending'
         })
-    @action(detail=True, methods=['post'])
-    def blockchain_callback(self, request, pk=None):
-        progress = self.get_object()
-        tx_hash = request.data.get('tx_hash')
-        message = request.data.get('message', '')
-        progress.blockchain_event_tx_hash = tx_hash
-        progress.last_blockchain_status = message
-        progress.save()
-        return Response({'status': 'success', 'updated': True})
 
-class ProgressSnapshotViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgressSnapshotViewSet(BlockchainCallbackMixin, NarrowListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ProgressSnapshotSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
         return ProgressSnapshot.objects.filter(user=self.request.user)
-    @action(detail=True, methods=['post'])
-    def blockchain_callback(self, request, pk=None):
-        snap = self.get_object()
-        tx_hash = request.data.get('tx_hash')
-        message = request.data.get('message', '')
-        snap.blockchain_event_tx_hash = tx_hash
-        snap.last_blockchain_status = message
-        snap.save()
-        return Response({'status': 'success', 'updated': True})
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=NDJSON_RENDERERS)
     def by_course(self, request):
         course_id = request.query_params.get('course_id')
         if not course_id:
             raise ValidationError("course_id parameter required")
-        snapshots = self.get_queryset().filter(course_id=course_id).order_by('snapshot_date')
+        snapshots = self.get_queryset().filter(course_id=course_id).only(
+            *serializer_columns(ProgressSnapshotSerializer)
+        ).order_by('snapshot_date')
+        if wants_json_lines(request):
+            return stream_json_lines(snapshots, self.get_serializer())
+        page = self.paginate_queryset(snapshots)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(snapshots, many=True)
         return Response({'status': 'success', 'data': serializer.data})
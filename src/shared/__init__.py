@@ -19,6 +19,8 @@ from .decorators import (
     require_admin,
     require_authenticated,
     log_action,
+    flush_admin_logs,
+    retry_on_db_error,
 )
 
 from .validators import (
@@ -60,6 +62,8 @@ __all__ = [
     'require_admin',
     'require_authenticated',
     'log_action',
+    'flush_admin_logs',
+    'retry_on_db_error',
     # Validators
     'validate_email',
     'validate_password',
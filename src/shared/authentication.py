@@ -0,0 +1,79 @@
+"""
+Authentication classes shared across services
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+AUTH_USER_CACHE_TIMEOUT = 60  # short TTL bounds staleness from writes that bypass signals
+
+# The only columns cached (the cache may be a shared Redis, so never the password hash): what
+# authentication, the permission decorators and request logging read (plus updated_at, so
+# auto_now still advances on a plain save()). Anything else, e.g. token_balance, which changes
+# through queryset.update(), loads live on access, and save() writes back only loaded columns.
+# Views that serialize the whole profile use with_all_fields().
+AUTH_USER_FIELDS = (
+    'id', 'email', 'username', 'first_name', 'last_name', 'wallet_address',
+    'is_active', 'is_staff', 'is_superuser', 'is_verified', 'is_banned', 'updated_at',
+)
+
+
+def auth_user_cache_key(user_id):
+    """Cache key for the user row behind a JWT's user_id claim"""
+    return f"auth:user:{user_id}"
+
+
+def invalidate_auth_users(*user_ids):
+    """Drop cached auth users once the current transaction commits.
+
+    post_save/post_delete call this for model saves. A queryset.update() of is_active or
+    is_banned sends no signal, so such a site must call it too, or the old flags are served
+    for up to AUTH_USER_CACHE_TIMEOUT.
+    """
+    keys = [auth_user_cache_key(user_id) for user_id in user_ids]
+    # Deferred to commit so a request racing the write can't re-cache pre-commit data
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def with_all_fields(user):
+    """The user with every column loaded: one SELECT instead of a query per deferred column"""
+    if not user.get_deferred_fields():
+        return user
+    return type(user)._default_manager.get(pk=user.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that serves the token's user from the cache instead of a SELECT per request.
+
+    Entries hold only AUTH_USER_FIELDS and are dropped when the user row is saved or deleted
+    (see src/users/signals.py). Bans and deactivations therefore go through save(); see
+    invalidate_auth_users() for writes that bypass it.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)  # raises InvalidToken
+
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            # Revocation compares against the password hash, which is never cached
+            return super().get_user(validated_token)
+
+        key = auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.only(*AUTH_USER_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                return super().get_user(validated_token)  # raises AuthenticationFailed
+            cache.set(key, user, AUTH_USER_CACHE_TIMEOUT)
+
+        # Same checks JWTAuthentication applies to a freshly loaded user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
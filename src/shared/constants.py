@@ -2,6 +2,8 @@
 Shared constants and configuration across services
 """
 
+from types import MappingProxyType
+
 # Token Rewards [web:152]
 TOKEN_REWARDS = {
     'LESSON_COMPLETE': 5,
@@ -60,3 +62,10 @@ RATE_LIMITS = {
     "api_default": {"limit": 100, "period": 3600}, # 100 requests per hour
     "chatbot": {"limit": 20, "period": 300},      # 20 per 5 min
 }
+
+# Lookup tables are read-only; expose them as mappingproxy views so a stray
+# assignment fails loudly instead of changing rewards process-wide
+TOKEN_REWARDS = MappingProxyType(TOKEN_REWARDS)
+TOKEN_COSTS = MappingProxyType(TOKEN_COSTS)
+RECOMMENDATION_WEIGHTS = MappingProxyType(RECOMMENDATION_WEIGHTS)
+RATE_LIMITS = MappingProxyType({name: MappingProxyType(rule) for name, rule in RATE_LIMITS.items()})
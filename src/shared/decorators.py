@@ -1,28 +1,65 @@
 """
 Shared decorators for the platform
 """
-from functools import wraps
-from rest_framework.response import Response
-from rest_framework import status
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from functools import partial, wraps
+from django.db import OperationalError, connection, transaction
+from rest_framework import exceptions
+
+from .utils import get_client_ip
+
+logger = logging.getLogger(__name__)
+
+# log_action queues AdminDashboardLog rows here; a daemon thread bulk-inserts them.
+# Bounded so a database outage can't grow it without limit: overflow is dropped and counted.
+ADMIN_LOG_BATCH_SIZE = 500
+ADMIN_LOG_FLUSH_INTERVAL = 1.0  # seconds
+ADMIN_LOG_QUEUE_SIZE = 10000
+_admin_log_queue = queue.Queue(maxsize=ADMIN_LOG_QUEUE_SIZE)
+_admin_log_dropped = 0
+_admin_log_lock = threading.Lock()
+_admin_log_flusher = None
+_AdminDashboardLog = None
+
+UserFlags = namedtuple('UserFlags', 'is_authenticated is_staff is_superuser is_verified is_banned')
+
+
+def _user_flags(request):
+    """
+    Access flags for request.user, computed once and cached on the request
+    so stacked checks don't each walk the user object again
+    """
+    flags = getattr(request, '_perm_cache', None)
+    if flags is None:
+        user = request.user
+        flags = request._perm_cache = UserFlags(
+            user.is_authenticated,
+            getattr(user, 'is_staff', False),
+            getattr(user, 'is_superuser', False),
+            getattr(user, 'is_verified', False),
+            getattr(user, 'is_banned', False),
+        )
+    return flags
 
 
 def require_admin(view_func):
     """
-    Decorator to require admin permissions
+    Decorator to require admin permissions. Failures are raised as DRF
+    exceptions and rendered by the shared exception handler.
     """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return Response(
-                {'status': 'error', 'message': 'Authentication required'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        flags = _user_flags(request)
+        if not flags.is_authenticated:
+            raise exceptions.NotAuthenticated('Authentication required')
         
-        if not (request.user.is_staff or request.user.is_superuser):
-            return Response(
-                {'status': 'error', 'message': 'Admin access required'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        if not (flags.is_staff or flags.is_superuser):
+            raise exceptions.PermissionDenied('Admin access required')
         
         return view_func(request, *args, **kwargs)
     
@@ -31,7 +68,9 @@ def require_admin(view_func):
 
 def log_action(action_type):
     """
-    Decorator to automatically log admin actions
+    Decorator to automatically log admin actions. Entries are queued and
+    bulk-inserted by a background thread (see flush_admin_logs), so the
+    response doesn't wait on the audit INSERT.
     """
     def decorator(view_func):
         @wraps(view_func)
@@ -42,8 +81,6 @@ def log_action(action_type):
             # Log successful actions (2xx status codes)
             if hasattr(response, 'status_code') and 200 <= response.status_code < 300:
                 try:
-                    from src.services.admin_service.models import AdminDashboardLog
-                    
                     # Get target info from kwargs if available
                     target_id = kwargs.get('pk', 0)
                     target_type = getattr(self, 'queryset', None)
@@ -52,15 +89,11 @@ def log_action(action_type):
                     else:
                         target_type = 'unknown'
                     
-                    # Get IP address
-                    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-                    if x_forwarded_for:
-                        ip_address = x_forwarded_for.split(',')[0]
-                    else:
-                        ip_address = request.META.get('REMOTE_ADDR', '0.0.0.0')
+                    # ip_address is NOT NULL on the log table
+                    ip_address = get_client_ip(request, default='0.0.0.0')
                     
-                    AdminDashboardLog.objects.create(
-                        admin_user=request.user if request.user.is_authenticated else None,
+                    row = dict(
+                        admin_user_id=request.user.pk if _user_flags(request).is_authenticated else None,
                         action_type=action_type,
                         target_type=target_type,
                         target_id=target_id,
@@ -72,29 +105,124 @@ def log_action(action_type):
                             'path': request.path
                         }
                     )
-                except Exception as e:
+                    # Queued only once the action commits: a rolled-back action leaves no audit row
+                    transaction.on_commit(partial(_enqueue_admin_log, row))
+                except Exception:
                     # Don't fail the request if logging fails
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Failed to log admin action: {str(e)}")
+                    logger.exception("Failed to log admin action")
             
             return response
         
         return wrapper
     return decorator
 
+def _admin_log_model():
+    """AdminDashboardLog, imported on first use (admin_service models need the app registry)"""
+    global _AdminDashboardLog
+    if _AdminDashboardLog is None:
+        from src.services.admin_service.models import AdminDashboardLog
+        _AdminDashboardLog = AdminDashboardLog
+    return _AdminDashboardLog
+
+
+def _enqueue_admin_log(row):
+    global _admin_log_dropped
+    try:
+        _admin_log_queue.put_nowait(row)
+    except queue.Full:
+        with _admin_log_lock:
+            _admin_log_dropped += 1
+    _start_admin_log_flusher()
+
+
+def flush_admin_logs(max_items=ADMIN_LOG_BATCH_SIZE):
+    """
+    Write up to max_items queued admin log rows with one bulk INSERT.
+    Returns the number of rows taken off the queue.
+    """
+    global _admin_log_dropped
+    batch = []
+    try:
+        while len(batch) < max_items:
+            batch.append(_admin_log_queue.get_nowait())
+    except queue.Empty:
+        pass
+    with _admin_log_lock:
+        dropped, _admin_log_dropped = _admin_log_dropped, 0
+    if dropped:
+        logger.error("Dropped %d admin log entries: queue full", dropped)
+    if not batch:
+        return 0
+    # Resolved only with rows in hand: the atexit drain also runs in processes without Django set up
+    AdminDashboardLog = _admin_log_model()
+    try:
+        AdminDashboardLog.objects.bulk_create(
+            [AdminDashboardLog(**row) for row in batch], batch_size=ADMIN_LOG_BATCH_SIZE
+        )
+    except Exception as e:
+        # Audit rows are best-effort, as they were when written inline
+        logger.error("Failed to write %d admin log entries: %s", len(batch), e)
+    return len(batch)
+
+
+def _drain_admin_logs():
+    while flush_admin_logs():
+        pass
+
+
+def _run_admin_log_flusher():
+    while True:
+        time.sleep(ADMIN_LOG_FLUSH_INTERVAL)
+        _drain_admin_logs()
+        # This thread's connection would otherwise stay open (and go stale) between flushes
+        connection.close()
+
+
+def _start_admin_log_flusher():
+    global _admin_log_flusher
+    if _admin_log_flusher is not None:
+        return
+    with _admin_log_lock:
+        if _admin_log_flusher is None:
+            _admin_log_flusher = threading.Thread(
+                target=_run_admin_log_flusher, name='admin-log-flusher', daemon=True
+            )
+            _admin_log_flusher.start()
+
+
+atexit.register(_drain_admin_logs)
+
+
 def require_authenticated(view_func):
     """
     Decorator to require authenticated user
     """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return Response(
-                {'status': 'error', 'message': 'Authentication required'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        if not _user_flags(request).is_authenticated:
+            raise exceptions.NotAuthenticated('Authentication required')
         
         return view_func(request, *args, **kwargs)
     
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def retry_on_db_error(retries=2, delay=0.05):
+    """
+    Decorator to re-run a view whose transaction hit a transient database
+    error (deadlock, serialization failure). The view must do all of its
+    writes inside its own transaction.atomic() block, and is only retried
+    when it is not already running inside an outer transaction.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(retries + 1):
+                try:
+                    return view_func(*args, **kwargs)
+                except OperationalError:
+                    if attempt == retries or connection.in_atomic_block:
+                        raise
+                    time.sleep(delay * (attempt + 1))
+        return wrapper
+    return decorator
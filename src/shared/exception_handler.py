@@ -2,13 +2,18 @@
 Custom exception handler for DRF to standardize error responses across the API
 """
 import logging
-import traceback
+from functools import lru_cache
+from types import MappingProxyType
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.http import Http404
 from django.db import IntegrityError
+from django.utils import timezone
+
+from .utils import get_client_ip
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +43,7 @@ def custom_exception_handler(exc, context):
         'path': getattr(request, 'path', 'unknown'),
         'user': getattr(getattr(request, 'user', None), 'email', 'anonymous'),
         'ip': get_client_ip(request) if request else 'unknown',
+        'timestamp': timezone.now().isoformat(),
     }
     
     # Handle DRF exceptions (response is not None)
@@ -109,8 +115,6 @@ def format_error_response(exc, status_code, response_data, request_info, error_c
     """
     Format error response in a consistent structure
     """
-    from django.utils import timezone
-    
     # Extract message from various error formats
     message = extract_error_message(response_data)
     
@@ -125,7 +129,7 @@ def format_error_response(exc, status_code, response_data, request_info, error_c
         'status': 'error',
         'message': message,
         'error_code': error_code,
-        'timestamp': timezone.now().isoformat(),
+        'timestamp': request_info.get('timestamp') or timezone.now().isoformat(),
         'path': request_info.get('path', 'unknown'),
     }
     
@@ -134,7 +138,6 @@ def format_error_response(exc, status_code, response_data, request_info, error_c
         error_response['errors'] = errors
     
     # Add debugging info in development
-    from django.conf import settings
     if settings.DEBUG:
         error_response['debug'] = {
             'exception_type': type(exc).__name__,
@@ -187,81 +190,68 @@ def extract_field_errors(response_data):
     return field_errors if field_errors else None
 
 
+# Exception type name -> error code, checked before the status-code fallback
+_ERROR_CODE_MAP = MappingProxyType({
+    'ValidationError': 'VALIDATION_ERROR',
+    'AuthenticationError': 'AUTHENTICATION_ERROR',
+    'PermissionDeniedError': 'PERMISSION_DENIED',
+    'ResourceNotFoundError': 'RESOURCE_NOT_FOUND',
+    'ConflictError': 'CONFLICT_ERROR',
+    'PaymentError': 'PAYMENT_ERROR',
+    'BlockchainError': 'BLOCKCHAIN_ERROR',
+    'RateLimitError': 'RATE_LIMIT_ERROR',
+    'NotAuthenticated': 'NOT_AUTHENTICATED',
+    'PermissionDenied': 'PERMISSION_DENIED',
+    'NotFound': 'NOT_FOUND',
+    'MethodNotAllowed': 'METHOD_NOT_ALLOWED',
+    'Throttled': 'THROTTLED',
+})
+
+_STATUS_CODE_MAP = MappingProxyType({
+    400: 'BAD_REQUEST',
+    401: 'UNAUTHORIZED',
+    403: 'FORBIDDEN',
+    404: 'NOT_FOUND',
+    405: 'METHOD_NOT_ALLOWED',
+    409: 'CONFLICT',
+    429: 'TOO_MANY_REQUESTS',
+    500: 'INTERNAL_SERVER_ERROR',
+    502: 'BAD_GATEWAY',
+    503: 'SERVICE_UNAVAILABLE',
+})
+
+
 def determine_error_code(exc, status_code):
     """
     Determine a machine-readable error code based on exception type and status
     """
-    exc_name = type(exc).__name__
-    
-    # Map exception types to error codes
-    error_code_map = {
-        'ValidationError': 'VALIDATION_ERROR',
-        'AuthenticationError': 'AUTHENTICATION_ERROR',
-        'PermissionDeniedError': 'PERMISSION_DENIED',
-        'ResourceNotFoundError': 'RESOURCE_NOT_FOUND',
-        'ConflictError': 'CONFLICT_ERROR',
-        'PaymentError': 'PAYMENT_ERROR',
-        'BlockchainError': 'BLOCKCHAIN_ERROR',
-        'RateLimitError': 'RATE_LIMIT_ERROR',
-        'NotAuthenticated': 'NOT_AUTHENTICATED',
-        'PermissionDenied': 'PERMISSION_DENIED',
-        'NotFound': 'NOT_FOUND',
-        'MethodNotAllowed': 'METHOD_NOT_ALLOWED',
-        'Throttled': 'THROTTLED',
-    }
-    
-    if exc_name in error_code_map:
-        return error_code_map[exc_name]
-    
-    # Fallback to status code based error codes
-    status_code_map = {
-        400: 'BAD_REQUEST',
-        401: 'UNAUTHORIZED',
-        403: 'FORBIDDEN',
-        404: 'NOT_FOUND',
-        405: 'METHOD_NOT_ALLOWED',
-        409: 'CONFLICT',
-        429: 'TOO_MANY_REQUESTS',
-        500: 'INTERNAL_SERVER_ERROR',
-        502: 'BAD_GATEWAY',
-        503: 'SERVICE_UNAVAILABLE',
-    }
-    
-    return status_code_map.get(status_code, 'UNKNOWN_ERROR')
+    return _code_for(type(exc).__name__, status_code)
+
+
+@lru_cache(maxsize=128)
+def _code_for(exc_name, status_code):
+    # Keyed on the name, not the exception object; the (name, status) domain is small
+    return _ERROR_CODE_MAP.get(exc_name) or _STATUS_CODE_MAP.get(status_code, 'UNKNOWN_ERROR')
 
 
 def log_exception(exc, error_data, request_info, include_traceback=False):
     """
     Log exception with appropriate level and context
     """
-    status_code = error_data.get('error_code', 'UNKNOWN')
+    error_code = error_data.get('error_code', 'UNKNOWN')
     
-    log_message = (
-        f"API Error - {status_code} | "
-        f"{request_info['method']} {request_info['path']} | "
-        f"User: {request_info['user']} | "
-        f"IP: {request_info['ip']} | "
-        f"Message: {error_data['message']}"
+    # %-style args: the message is only formatted if a handler emits the record
+    log_format = "API Error - %s | %s %s | User: %s | IP: %s | Message: %s"
+    log_args = (
+        error_code, request_info['method'], request_info['path'],
+        request_info['user'], request_info['ip'], error_data['message'],
     )
     
     # Determine log level based on status code
-    if error_data.get('error_code') in ['INTERNAL_ERROR', 'BLOCKCHAIN_ERROR', 'PAYMENT_ERROR']:
-        logger.error(log_message)
-        if include_traceback:
-            logger.error(f"Traceback: {traceback.format_exc()}")
-    elif error_data.get('error_code') in ['VALIDATION_ERROR', 'NOT_FOUND']:
-        logger.warning(log_message)
-    else:
-        logger.info(log_message)
-
-
-def get_client_ip(request):
-    """
-    Get client IP address from request
-    """
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
+    if error_code in ('INTERNAL_ERROR', 'BLOCKCHAIN_ERROR', 'PAYMENT_ERROR'):
+        # exc_info is only formatted if a handler actually emits the record
+        logger.error(log_format, *log_args, exc_info=exc if include_traceback else None)
+    elif error_code in ('VALIDATION_ERROR', 'NOT_FOUND'):
+        logger.warning(log_format, *log_args)
     else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+        logger.info(log_format, *log_args)
@@ -0,0 +1,69 @@
+"""
+Logging handlers that keep sink I/O off the request thread
+"""
+
+import logging
+import os
+import queue
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+# Live handlers, so a forked child can restart their listener threads (threads don't survive fork)
+_queued_handlers = weakref.WeakSet()
+
+
+class QueuedFileHandler(QueueHandler):
+    """FileHandler whose writes happen on a background QueueListener thread.
+
+    The record is formatted by this handler (so LOGGING's formatter applies) and only the
+    disk write is deferred. dictConfig can't wire a QueueListener to named handlers before
+    Python 3.12, hence the wrapper.
+
+    Processes that configure logging and then fork (Celery prefork, gunicorn --preload) get
+    a fresh queue and listener in each child; see _restart_in_child().
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        super().__init__(queue.SimpleQueue())
+        self.file_handler = logging.FileHandler(filename, mode=mode, encoding=encoding, delay=delay)
+        self._listening = False
+        self._start_listener()
+        _queued_handlers.add(self)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.file_handler)
+        self.listener.start()
+        self._pid = os.getpid()
+        self._listening = True
+
+    def _restart_in_child(self):
+        # The inherited listener thread doesn't exist here, and records left in the copied
+        # queue are the parent's to write; start over with an empty queue
+        if self._listening and self._pid != os.getpid():
+            self.queue = queue.SimpleQueue()
+            self._start_listener()
+
+    def enqueue(self, record):
+        # Backstop for forks that bypassed the at-fork hook
+        if self._pid != os.getpid():
+            self._restart_in_child()
+        super().enqueue(record)
+
+    def close(self):
+        # Drain pending records before closing the file; close() may run more than once
+        # (explicitly and again from logging's shutdown), but the listener stops only once
+        if self._listening:
+            self._listening = False
+            if self._pid == os.getpid():
+                self.listener.stop()
+        self.file_handler.close()
+        super().close()
+
+
+def _restart_queued_handlers():
+    for handler in list(_queued_handlers):
+        handler._restart_in_child()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_queued_handlers)
@@ -2,13 +2,81 @@
 Logging middleware for request/response tracking
 """
 import logging
-import time
+from time import monotonic
 import json
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 
+from .utils import get_client_ip
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger('api_requests')
 
+# Substrings that mark a key's value as secret in logged bodies
+_SENSITIVE_FIELDS = frozenset({
+    'password', 'token', 'secret', 'api_key', 'private_key',
+    'access_token', 'refresh_token', 'card_number', 'cvv',
+    'ssn', 'credit_card',
+})
+
+# Request bodies are only parsed for logging on these methods, and only up to this size
+_BODY_METHODS = frozenset({'POST', 'PUT', 'PATCH'})
+MAX_LOGGED_BODY_BYTES = 16 * 1024
+
+# PerformanceLoggingMiddleware warns about requests slower than this
+SLOW_REQUEST_SECONDS = 2.0
+
+# Paths never worth a log line; a tuple so str.startswith checks them all in one call
+_SKIP_LOG_PREFIXES = (
+    '/admin/jsi18n/',
+    '/static/',
+    '/media/',
+    '/favicon.ico',
+)
+
+
+# Parse bytes / dump str for log lines; orjson when installed, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type.
+if orjson is not None:
+    def _loads(raw):
+        return orjson.loads(raw)
+
+    def _dumps(data):
+        # DRF error dicts for list/dict fields use int keys, which orjson rejects by default
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+else:
+    def _loads(raw):
+        return json.loads(raw.decode('utf-8'))
+
+    def _dumps(data):
+        return json.dumps(data, default=str)
+
+
+def _is_sensitive_key(key):
+    lower_key = str(key).lower()
+    return any(field in lower_key for field in _SENSITIVE_FIELDS)
+
+
+def _has_sensitive_keys(data):
+    """
+    True if any key in the dict, or in dicts nested in it or in its lists, is sensitive
+    """
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        for key, value in current.items():
+            if _is_sensitive_key(key):
+                return True
+            if isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, dict))
+    return False
+
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """
@@ -20,10 +88,15 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         Log incoming request details
         """
         # Store request start time
-        request._start_time = time.time()
+        request._start_time = monotonic()
         
-        # Skip logging for certain paths
-        if self._should_skip_logging(request.path):
+        # Skip logging for certain paths (decided once, reused by the later hooks)
+        request._skip_log = self._should_skip_logging(request.path)
+        if request._skip_log:
+            return None
+        
+        # Everything below only feeds the INFO record; don't build it if nothing will emit it
+        if not logger.isEnabledFor(logging.INFO):
             return None
         
         # Get request details
@@ -35,25 +108,33 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             'method': request.method,
             'path': request.path,
             'user': user_email,
-            'ip': self._get_client_ip(request),
+            'ip': get_client_ip(request),
             'user_agent': request.META.get('HTTP_USER_AGENT', '')[:200],
         }
         
-        # Log query parameters
+        # Log query parameters as the query string (keeps repeated keys, no per-key copies);
+        # fall back to a redacted mapping when a parameter name looks sensitive
         if request.GET:
-            log_data['query_params'] = dict(request.GET)
+            if any(_is_sensitive_key(key) for key in request.GET):
+                log_data['query_params'] = self._sanitize_data(dict(request.GET.lists()))
+            else:
+                log_data['query_params'] = request.GET.urlencode()
         
-        # Log request body for POST/PUT/PATCH (excluding sensitive data)
-        if request.method in ['POST', 'PUT', 'PATCH'] and request.content_type == 'application/json':
-            try:
-                body = json.loads(request.body.decode('utf-8'))
-                # Remove sensitive fields
-                safe_body = self._sanitize_data(body)
-                log_data['body'] = safe_body
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                log_data['body'] = '[Unable to parse body]'
+        # Log request body for POST/PUT/PATCH (excluding sensitive data). Checked before touching
+        # request.body, which would read the whole upload into memory.
+        if request.method in _BODY_METHODS and request.content_type == 'application/json':
+            if self._content_length(request) > MAX_LOGGED_BODY_BYTES:
+                log_data['body'] = '[Body too large to log]'
+            else:
+                try:
+                    body = _loads(request.body)
+                    # Remove sensitive fields
+                    safe_body = self._sanitize_data(body)
+                    log_data['body'] = safe_body
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    log_data['body'] = '[Unable to parse body]'
         
-        logger.info(f"Request: {json.dumps(log_data)}")
+        logger.info("Request: %s", _dumps(log_data))
         
         return None
     
@@ -62,13 +143,26 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         Log response details
         """
         # Skip logging for certain paths
-        if self._should_skip_logging(request.path):
+        skip = getattr(request, '_skip_log', None)
+        if skip is None:
+            skip = self._should_skip_logging(request.path)
+        if skip:
+            return response
+        
+        # Use appropriate log level based on status code, and stop early if it's filtered out
+        if response.status_code >= 500:
+            level = logging.ERROR
+        elif response.status_code >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        if not logger.isEnabledFor(level):
             return response
         
         # Calculate request duration
         duration = None
         if hasattr(request, '_start_time'):
-            duration = time.time() - request._start_time
+            duration = monotonic() - request._start_time
         
         # Get user info
         user = getattr(request, 'user', None)
@@ -89,18 +183,12 @@ class RequestLoggingMiddleware(MiddlewareMixin):
                 if hasattr(response, 'data'):
                     log_data['response'] = self._sanitize_data(response.data)
                 elif response.content:
-                    response_body = json.loads(response.content.decode('utf-8'))
+                    response_body = _loads(response.content)
                     log_data['response'] = self._sanitize_data(response_body)
             except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
                 log_data['response'] = '[Unable to parse response]'
         
-        # Use appropriate log level based on status code
-        if response.status_code >= 500:
-            logger.error(f"Response: {json.dumps(log_data)}")
-        elif response.status_code >= 400:
-            logger.warning(f"Response: {json.dumps(log_data)}")
-        else:
-            logger.info(f"Response: {json.dumps(log_data)}")
+        logger.log(level, "Response: %s", _dumps(log_data))
         
         return response
     
@@ -115,12 +203,12 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             'method': request.method,
             'path': request.path,
             'user': user_email,
-            'ip': self._get_client_ip(request),
+            'ip': get_client_ip(request),
             'exception_type': type(exception).__name__,
             'exception_message': str(exception),
         }
         
-        logger.error(f"Unhandled Exception: {json.dumps(log_data)}", exc_info=True)
+        logger.error("Unhandled Exception: %s", _dumps(log_data), exc_info=True)
         
         return None
     
@@ -128,51 +216,43 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         """
         Determine if logging should be skipped for this path
         """
-        skip_paths = [
-            '/admin/jsi18n/',
-            '/static/',
-            '/media/',
-            '/favicon.ico',
-        ]
-        return any(path.startswith(skip_path) for skip_path in skip_paths)
+        return path.startswith(_SKIP_LOG_PREFIXES)
     
-    def _get_client_ip(self, request):
+    def _content_length(self, request):
         """
-        Get client IP address from request
+        Declared body size in bytes (0 if missing or malformed)
         """
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        try:
+            return int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return 0
     
     def _sanitize_data(self, data):
         """
         Remove sensitive data from logs
         """
-        if not isinstance(data, dict):
-            return data
-        
-        sensitive_fields = [
-            'password', 'token', 'secret', 'api_key', 'private_key',
-            'access_token', 'refresh_token', 'card_number', 'cvv',
-            'ssn', 'credit_card'
-        ]
+        if not isinstance(data, dict) or not _has_sensitive_keys(data):
+            return data  # nothing to redact: log the payload as-is, no copy
         
+        # Walk nested dicts with an explicit stack: (source dict, copy being filled)
         sanitized = {}
-        for key, value in data.items():
-            if any(field in key.lower() for field in sensitive_fields):
-                sanitized[key] = '***REDACTED***'
-            elif isinstance(value, dict):
-                sanitized[key] = self._sanitize_data(value)
-            elif isinstance(value, list):
-                sanitized[key] = [
-                    self._sanitize_data(item) if isinstance(item, dict) else item
-                    for item in value
-                ]
-            else:
-                sanitized[key] = value
+        stack = [(data, sanitized)]
+        while stack:
+            src, dst = stack.pop()
+            for key, value in src.items():
+                if _is_sensitive_key(key):
+                    dst[key] = '***REDACTED***'
+                elif isinstance(value, dict):
+                    dst[key] = child = {}
+                    stack.append((value, child))
+                elif isinstance(value, list):
+                    dst[key] = items = list(value)
+                    for i, item in enumerate(items):
+                        if isinstance(item, dict):
+                            items[i] = child = {}
+                            stack.append((item, child))
+                else:
+                    dst[key] = value
         
         return sanitized
 
@@ -183,18 +263,16 @@ class PerformanceLoggingMiddleware(MiddlewareMixin):
     """
     
     def process_request(self, request):
-        request._perf_start_time = time.time()
+        request._perf_start_time = monotonic()
         return None
     
     def process_response(self, request, response):
-        if hasattr(request, '_perf_start_time'):
-            duration = time.time() - request._perf_start_time
-            
-            # Log slow requests (> 2 seconds)
-            if duration > 2.0:
-                logger.warning(
-                    f"Slow Request: {request.method} {request.path} "
-                    f"took {duration:.2f}s | Status: {response.status_code}"
-                )
+        start = getattr(request, '_perf_start_time', None)
+        # Log slow requests
+        if start is not None and (duration := monotonic() - start) > SLOW_REQUEST_SECONDS:
+            logger.warning(
+                "Slow Request: %s %s took %.2fs | Status: %s",
+                request.method, request.path, duration, response.status_code
+            )
         
         return response
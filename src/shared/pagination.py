@@ -2,7 +2,7 @@
 Custom pagination for API responses
 """
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
 
 
@@ -25,3 +25,39 @@ class StandardPagination(PageNumberPagination):
             },
             'data': data,
         })
+
+
+class StandardCursorPagination(CursorPagination):
+    """Cursor pagination for deep per-user histories: no COUNT(*), index range scan per page.
+
+    Views pick the (indexed, non-null) cursor column with a ``cursor_ordering`` attribute,
+    and opt in per action (``@action(pagination_class=StandardCursorPagination)``) so their
+    generic list keeps StandardPagination. End a multi-column ordering with a unique column
+    so ties on the leading one page deterministically. If the leading column is mutable
+    (e.g. updated_at), a row updated mid-scroll moves to the front, as it would on a refresh.
+
+    Unlike StandardPagination, the ``pagination`` envelope has only ``next``, ``previous``
+    and ``page_size``: there is no ``count``, ``total_pages`` or ``current_page``, since
+    computing them is the COUNT(*) this class avoids. Clients follow ``next`` until null.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering:
+            return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'status': 'success',
+            'pagination': {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'page_size': self.page_size,
+            },
+            'data': data,
+        })
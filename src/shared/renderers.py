@@ -0,0 +1,20 @@
+"""
+Custom renderers for API responses
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Newline-delimited JSON, selected with ``Accept: application/x-ndjson`` or ``?format=ndjson``.
+
+    Views that offer it stream their rows one object per line themselves; anything rendered
+    through here instead (e.g. an error body) becomes a single line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return super().render(data, accepted_media_type, renderer_context) + b'\n'
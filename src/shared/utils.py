@@ -3,8 +3,7 @@ Shared utility functions
 """
 
 import logging
-import random
-import string
+import secrets
 from django.core.mail import send_mail
 from django.conf import settings
 
@@ -29,19 +28,18 @@ def send_email(to_email, subject, message, html_message=None):
         return False
 
 
-def get_client_ip(request):
-    """Get client IP address from request"""
+def get_client_ip(request, default=None):
+    """Get client IP address from request (first X-Forwarded-For hop, else REMOTE_ADDR)"""
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+        return x_forwarded_for.partition(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', default)
 
 
 def generate_random_token(length=32):
-    """Generate random token"""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    """Generate a cryptographically secure URL-safe random token of the given length"""
+    # token_urlsafe(n) yields ~1.3n characters; n bytes is always enough to cover length
+    return secrets.token_urlsafe(length)[:length]
 
 
 def calculate_completion_percentage(completed, total):
@@ -3,35 +3,77 @@ Custom validators for the API
 """
 
 import re
+import string
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_WALLET_RE = re.compile(r'^0x[a-fA-F0-9]{40}$')
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*()_+-=[]{}|;:,.<>?')
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+_ASCII_DIGITS = frozenset(string.digits)
+
 
 def validate_email(email):
     """Validate email format"""
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_regex, email):
+    # C-level str checks reject most malformed input before the regex: one '@' with a
+    # non-empty local part, a '.' somewhere after it, and the RFC 5321 length limit
+    at = email.find('@')
+    if (at < 1 or at != email.rfind('@') or len(email) > 254
+            or email.find('.', at) == -1 or not _EMAIL_RE.match(email)):
         raise DjangoValidationError('Invalid email format')
 
 
+def _password_classes(password):
+    """(has_upper, has_lower, has_digit, has_special) for a password"""
+    if password.isascii():
+        # ASCII fast path: set construction and disjointness checks all run in C
+        chars = set(password)
+        return (
+            not chars.isdisjoint(_ASCII_UPPER),
+            not chars.isdisjoint(_ASCII_LOWER),
+            not chars.isdisjoint(_ASCII_DIGITS),
+            not chars.isdisjoint(_PASSWORD_SPECIALS),
+        )
+    # Unicode letters/digits count too, so fall back to one pass with the str predicates
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if char.isupper():
+            has_upper = True
+        elif char.islower():
+            has_lower = True
+        elif char.isdigit():
+            has_digit = True
+        elif char in _PASSWORD_SPECIALS:
+            has_special = True
+        if has_upper and has_lower and has_digit and has_special:
+            break
+    return has_upper, has_lower, has_digit, has_special
+
+
 def validate_password(password):
     """Validate password strength"""
     if len(password) < 8:
         raise DjangoValidationError('Password must be at least 8 characters')
     
-    if not any(char.isupper() for char in password):
+    has_upper, has_lower, has_digit, has_special = _password_classes(password)
+    
+    if not has_upper:
         raise DjangoValidationError('Password must contain uppercase letter')
     
-    if not any(char.islower() for char in password):
+    if not has_lower:
         raise DjangoValidationError('Password must contain lowercase letter')
     
-    if not any(char.isdigit() for char in password):
+    if not has_digit:
         raise DjangoValidationError('Password must contain digit')
     
-    if not any(char in '!@#$%^&*()_+-=[]{}|;:,.<>?' for char in password):
+    if not has_special:
         raise DjangoValidationError('Password must contain special character')
 
 
 def validate_wallet_address(address):
     """Validate Ethereum wallet address"""
-    if not re.match(r'^0x[a-fA-F0-9]{40}$', address):
+    # Cheap shape check first; the regex then only vets the hex digits. (int(x, 16) isn't a
+    # safe substitute: it accepts '_', a sign, and surrounding whitespace.)
+    if len(address) != 42 or not address.startswith('0x') or not _WALLET_RE.match(address):
         raise DjangoValidationError('Invalid wallet address format')
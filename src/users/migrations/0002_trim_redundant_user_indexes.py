@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:09
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='custom_user_email_c8f161_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='custom_user_wallet__2b2ecf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='custom_user_is_acti_f5beb2_idx',
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='email',
+            field=models.EmailField(max_length=255, unique=True, validators=[django.core.validators.EmailValidator()]),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_banned', True)), fields=['-created_at'], name='user_banned_idx'),
+        ),
+    ]
@@ -43,8 +43,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(
         max_length=255,
         unique=True,
-        validators=[EmailValidator()],
-        db_index=True
+        validators=[EmailValidator()]
     )
     username = models.CharField(max_length=150, unique=True)
     first_name = models.CharField(max_length=150, blank=True)
@@ -112,10 +111,14 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     class Meta:
         db_table = 'custom_users'
         ordering = ['-created_at']
+        # email and wallet_address are already indexed by their unique constraints
         indexes = [
-            models.Index(fields=['email']),
-            models.Index(fields=['wallet_address']),
-            models.Index(fields=['is_active']),
+            # Admin "banned users" list: small partial index instead of a boolean B-tree
+            models.Index(
+                fields=['-created_at'],
+                name='user_banned_idx',
+                condition=models.Q(is_banned=True),
+            ),
         ]
     
     def __str__(self):
@@ -29,11 +29,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password')
         user = User.objects.create_user(password=password, **validated_data)
         return user
+    
+    def to_representation(self, instance):
+        # Respond with the profile shape, so the view needs no second serializer pass
+        return UserProfileSerializer(instance, context=self.context).data
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """User profile serializer"""
-    full_name = serializers.SerializerMethodField()
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
     
     class Meta:
         model = User
@@ -44,9 +48,6 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'is_verified', 'created_at'
         ]
         read_only_fields = ['id', 'token_balance', 'is_verified', 'created_at']
-    
-    def get_full_name(self, obj):
-        return obj.get_full_name()
 
 
 class UpdateProfileSerializer(serializers.ModelSerializer):
@@ -57,6 +58,17 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
             'first_name', 'last_name', 'avatar_url', 'bio',
             'education_level', 'learning_goals'
         ]
+    
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # UPDATE only the submitted columns; a model save (not queryset.update) keeps
+        # updated_at's auto_now and the post_save auth-cache invalidation
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+    
+    def to_representation(self, instance):
+        return UserProfileSerializer(instance, context=self.context).data
 
 
 class ConnectWalletSerializer(serializers.Serializer):
@@ -64,10 +76,9 @@ class ConnectWalletSerializer(serializers.Serializer):
     wallet_address = serializers.CharField(max_length=42, min_length=42)
     
     def validate_wallet_address(self, value):
+        # Uniqueness is left to the unique index; connect_wallet maps the IntegrityError
         if not value.startswith('0x'):
             raise serializers.ValidationError("Invalid wallet address format")
-        if User.objects.filter(wallet_address=value).exists():
-            raise serializers.ValidationError("Wallet already connected to another account")
         return value
 
 
@@ -80,4 +91,7 @@ class ChangePasswordSerializer(serializers.Serializer):
     def validate(self, data):
         if data['new_password'] != data['new_password_confirm']:
             raise serializers.ValidationError("New passwords don't match")
+        # Plain string compare, so the view never hashes a no-op change
+        if data['new_password'] == data['old_password']:
+            raise serializers.ValidationError("New password must differ from the old password")
         return data
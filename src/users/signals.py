@@ -0,0 +1,14 @@
+"""
+User cache invalidation signals
+"""
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from src.shared.authentication import invalidate_auth_users
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_auth_user_cache(sender, instance, **kwargs):
+    """Drop the cached auth user when the row changes (profile, password, ban, deactivation)"""
+    invalidate_auth_users(instance.pk)
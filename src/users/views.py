@@ -5,7 +5,10 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 import logging
 
@@ -15,11 +18,23 @@ from .serializers import (
     ChangePasswordSerializer
 )
 from src.shared.exceptions import ValidationError, AuthenticationError
+from src.shared.authentication import with_all_fields
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _issue_tokens(user):
+    """Refresh/access pair for a user, each token signed exactly once"""
+    refresh = RefreshToken.for_user(user)
+    # Identity claims ride along (access_token copies them) so consumers needn't look the user up
+    refresh['email'] = user.email
+    refresh['username'] = user.username
+    # access_token builds a new token on every attribute access; take it once
+    access = refresh.access_token
+    return {'refresh': str(refresh), 'access': str(access)}
+
+
 class UserViewSet(viewsets.GenericViewSet):
     """User management viewset"""
     queryset = User.objects.all()
@@ -47,18 +62,12 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
-        
         return Response({
             'status': 'success',
             'message': 'User registered successfully',
             'data': {
-                'user': UserProfileSerializer(user).data,
-                'tokens': {
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token)
-                }
+                'user': serializer.data,
+                'tokens': _issue_tokens(user)
             }
         }, status=status.HTTP_201_CREATED)
     
@@ -71,37 +80,38 @@ class UserViewSet(viewsets.GenericViewSet):
         if not email or not password:
             raise ValidationError("Email and password required")
         
-        user = authenticate(request, username=email, password=password)
+        # One fetch and a direct password check instead of authenticate()'s backend dispatch;
+        # the full row is loaded because the response serializes the profile
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            # Hash anyway so unknown emails take as long as wrong passwords (as ModelBackend does),
+            # without building a throwaway User to do it
+            make_password(password)
+            raise AuthenticationError("Invalid credentials")
         
-        if not user:
+        if not user.check_password(password) or not user.is_active:
             raise AuthenticationError("Invalid credentials")
         
         if user.is_banned:
             raise AuthenticationError(f"Account banned: {user.banned_reason}")
         
-        # Update last login
-        from django.utils import timezone
+        # Update last login (single-column UPDATE, no model save)
         user.last_login_at = timezone.now()
-        user.save()
-        
-        # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        User.objects.filter(pk=user.pk).update(last_login_at=user.last_login_at)
         
         return Response({
             'status': 'success',
             'data': {
                 'user': UserProfileSerializer(user).data,
-                'tokens': {
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token)
-                }
+                'tokens': _issue_tokens(user)
             }
         })
     
     @action(detail=False, methods=['get'])
     def profile(self, request):
         """Get current user profile"""
-        serializer = UserProfileSerializer(request.user)
+        serializer = UserProfileSerializer(with_all_fields(request.user))
         return Response({
             'status': 'success',
             'data': serializer.data
@@ -111,7 +121,7 @@ class UserViewSet(viewsets.GenericViewSet):
     def update_profile(self, request):
         """Update user profile"""
         serializer = self.get_serializer(
-            request.user,
+            with_all_fields(request.user),
             data=request.data,
             partial=request.method == 'PATCH'
         )
@@ -121,7 +131,7 @@ class UserViewSet(viewsets.GenericViewSet):
         return Response({
             'status': 'success',
             'message': 'Profile updated successfully',
-            'data': UserProfileSerializer(request.user).data
+            'data': serializer.data
         })
     
     @action(detail=False, methods=['post'])
@@ -130,24 +140,30 @@ class UserViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        request.user.wallet_address = serializer.validated_data['wallet_address']
-        request.user.save()
+        user = with_all_fields(request.user)
+        user.wallet_address = serializer.validated_data['wallet_address']
+        try:
+            # Savepoint so a duplicate doesn't poison an enclosing transaction
+            with transaction.atomic():
+                user.save(update_fields=['wallet_address', 'updated_at'])
+        except IntegrityError:
+            raise ValidationError("Wallet already connected to another account")
         
-        logger.info(f"Wallet connected for user {request.user.email}")
+        logger.info("Wallet connected for user %s", user.email)
         
         return Response({
             'status': 'success',
             'message': 'Wallet connected successfully',
-            'data': UserProfileSerializer(request.user).data
+            'data': UserProfileSerializer(user).data
         })
     
     @action(detail=False, methods=['post'])
     def disconnect_wallet(self, request):
         """Disconnect Web3 wallet"""
         request.user.wallet_address = None
-        request.user.save()
+        request.user.save(update_fields=['wallet_address', 'updated_at'])
         
-        logger.info(f"Wallet disconnected for user {request.user.email}")
+        logger.info("Wallet disconnected for user %s", request.user.email)
         
         return Response({
             'status': 'success',
@@ -168,9 +184,9 @@ class UserViewSet(viewsets.GenericViewSet):
         
         # Set new password
         user.set_password(serializer.validated_data['new_password'])
-        user.save()
+        user.save(update_fields=['password', 'updated_at'])
         
-        logger.info(f"Password changed for user {user.email}")
+        logger.info("Password changed for user %s", user.email)
         
         return Response({
             'status': 'success',